@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 import time
 from typing import Dict, Tuple, Optional, List, Callable
-from agente___.algorithms.informed import greedy_codicioso, a_estrella
+from agente___.algorithms.informed import (
+    greedy_codicioso, a_estrella, ida_estrella, a_estrella_bidireccional
+)
 from agente___.algorithms.utils import camino_menor_costo_ucs  # UCS existente
 
 Estado = str
@@ -13,21 +15,32 @@ class AgenteInformado:
     Algoritmos disponibles:
       - "greedy":  Búsqueda Codiciosa (prioriza por h(n) = costo_h)
       - "a*":      A estrella (prioriza por f(n) = g(n) + h(n))
+      - "ida*":    IDA* (A* por profundización iterativa, memoria O(profundidad))
+      - "mm":      A* bidireccional MM; necesita heuristica_factory (h hacia un goal dado).
+                   Con PDB conviene lambda g: h_pdb_factory(g, guardar=False): la PDB
+                   hacia el inicio es de un solo uso
       - "ucs":     Costo Uniforme (tu implementación en utils.py)
     """
     def __init__(self, grafo_ponderado: GrafoPonderado, inicio: Estado, objetivo: Estado,
-                 algoritmo: str = "a*", heuristica: Optional[Callable[[Estado], float]] = None):
+                 algoritmo: str = "a*", heuristica: Optional[Callable[[Estado], float]] = None,
+                 heuristica_factory: Optional[Callable[[Estado], Callable[[Estado], float]]] = None):
         self.grafo = grafo_ponderado
         self.inicio = inicio
         self.objetivo = objetivo
         self.algoritmo = algoritmo.lower()
-        self.h = heuristica or (lambda _: 0.0)
+        self.h_factory = heuristica_factory
+        self.h = heuristica or (heuristica_factory(objetivo) if heuristica_factory else (lambda _: 0.0))
 
     def resolver(self) -> Tuple[Optional[Path], float, int, float]:
         t0 = time.perf_counter()
 
         if self.algoritmo == "greedy":
             camino, costo, expandidos = greedy_codicioso(self.grafo, self.inicio, self.objetivo, self.h)
+        elif self.algoritmo == "ida*":
+            camino, costo, expandidos = ida_estrella(self.grafo, self.inicio, self.objetivo, self.h)
+        elif self.algoritmo == "mm":
+            h_inv = self.h_factory(self.inicio) if self.h_factory else (lambda _: 0.0)
+            camino, costo, expandidos = a_estrella_bidireccional(self.grafo, self.inicio, self.objetivo, self.h, h_inv)
         elif self.algoritmo == "ucs":
             camino, costo, expandidos = camino_menor_costo_ucs(self.grafo, self.inicio, self.objetivo)
         else:
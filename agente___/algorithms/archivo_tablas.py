@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+Archivos versionados de tablas precalculadas (PDB, distancias exactas, WD).
+
+Formato común: MAGIC(4) | version u32 | len(meta) u32 | meta JSON | datos.
+Se escribe en un .tmp y se renombra con os.replace: un corte nunca deja un
+archivo a medias con el nombre final.
+
+    guardar_tabla(ruta, b"NDST", 1, {"n": 3}, [tabla])
+    meta, inicio = leer_cabecera(datos, ruta, b"NDST", 1, "tabla de distancias")
+"""
+from __future__ import annotations
+import json, os, struct
+from typing import Iterable, Tuple
+
+DIR_CACHE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "cache")
+
+def guardar_tabla(ruta: str, magic: bytes, version: int, meta: dict, bloques: Iterable[bytes]) -> None:
+    meta_bytes = json.dumps(meta).encode("utf-8")
+    if os.path.dirname(ruta):
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    tmp = ruta + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(magic)
+        f.write(struct.pack("<II", version, len(meta_bytes)))
+        f.write(meta_bytes)
+        for bloque in bloques:
+            f.write(bloque)
+    os.replace(tmp, ruta)
+
+def leer_cabecera(datos, ruta: str, magic: bytes, version: int, nombre: str) -> Tuple[dict, int]:
+    """(meta, offset de los datos) de bytes o mmap; ValueError si no es el tipo o la versión."""
+    if datos[:4] != magic:
+        raise ValueError(f"{ruta}: no es un archivo de {nombre}")
+    version_archivo, largo = struct.unpack_from("<II", datos, 4)
+    if version_archivo != version:
+        raise ValueError(f"{ruta}: versión de {nombre} {version_archivo} no soportada (se espera {version})")
+    return json.loads(bytes(datos[12:12 + largo]).decode("utf-8")), 12 + largo
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Caché LRU de soluciones óptimas para sliding tile.
+
+Cada estado de un camino óptimo conoce su camino restante a la meta: se guarda
+una sola vez el camino (tupla) y por estado solo (camino, índice). Así, si el
+usuario sigue (aunque sea en parte) un plan, pedir otra solución o una pista
+desde cualquier estado del plan se responde sin buscar.
+
+    cache = CacheSoluciones(capacidad=100_000)
+    cache.guardar(camino)                 # [inicio, ..., meta], óptimo
+    hit = cache.buscar(s)                 # (resto, distancia) o None
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+
+from agente___.algorithms.npuzzle_utils import empaquetar_estado
+
+class CacheSoluciones:
+    def __init__(self, capacidad: int = 100_000):
+        self.capacidad = max(1, int(capacidad))
+        self._entradas: "OrderedDict[object, Tuple[tuple, int]]" = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    @staticmethod
+    def _clave(s):
+        # clave empaquetada: un int hashea y ocupa menos que la tupla
+        return s if isinstance(s, int) else empaquetar_estado(s)
+
+    def guardar(self, camino: Sequence) -> None:
+        """Registra un camino ÓPTIMO a la meta: cada estado queda con su sufijo."""
+        camino = tuple(camino)
+        entradas = self._entradas
+        for i, s in enumerate(camino):
+            clave = self._clave(s)
+            entradas[clave] = (camino, i)
+            entradas.move_to_end(clave)
+        while len(entradas) > self.capacidad:
+            entradas.popitem(last=False)  # el menos usado
+
+    def _consultar(self, s) -> Optional[Tuple[tuple, int]]:
+        clave = self._clave(s)
+        entrada = self._entradas.get(clave)
+        if entrada is None:
+            self.fallos += 1
+            return None
+        self.aciertos += 1
+        self._entradas.move_to_end(clave)
+        return entrada
+
+    def buscar(self, s) -> Optional[Tuple[List, int]]:
+        """(camino restante sin s, distancia a la meta) si s está en un camino guardado."""
+        entrada = self._consultar(s)
+        if entrada is None:
+            return None
+        camino, i = entrada
+        return list(camino[i + 1:]), len(camino) - 1 - i
+
+    def siguiente(self, s):
+        """Siguiente estado óptimo desde s (None si no está en caché o s es la meta)."""
+        entrada = self._consultar(s)
+        if entrada is None:
+            return None
+        camino, i = entrada
+        return camino[i + 1] if i + 1 < len(camino) else None
+
+    @property
+    def tasa_aciertos(self) -> float:
+        total = self.aciertos + self.fallos
+        return self.aciertos / total if total else 0.0
+
+    def resumen(self) -> str:
+        return (f"{self.aciertos}/{self.aciertos + self.fallos} aciertos "
+                f"({self.tasa_aciertos * 100:.0f}%), {len(self)} estados")
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def __contains__(self, s) -> bool:
+        return self._clave(s) in self._entradas
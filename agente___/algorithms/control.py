@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Corte cooperativo de las búsquedas: presupuesto de expansiones, deadline y
+cancelación desde otro hilo.
+
+    token = TokenCancelacion()          # otro hilo llama token.cancelar()
+    try:
+        a_estrella(grafo, inicio, meta, h, max_expansiones=10**6,
+                   deadline_ms=2000, cancelar=token)
+    except BusquedaAbortada as e:
+        print(e.motivo, e.cota_f, e.mejor_h, e.camino_parcial)
+
+Sin límites (todos None) los motores no crean control y no pagan nada extra.
+"""
+from __future__ import annotations
+import threading, time
+from typing import List, Optional
+
+MAX_EXPANSIONES = "max_expansiones"
+DEADLINE = "deadline"
+CANCELADO = "cancelado"
+MEMORIA = "memoria"         # SMA*: el camino a la meta no cabe en max_nodos
+
+class TokenCancelacion:
+    """Bandera compartida entre hilos: cancelar() hace abortar la búsqueda en curso."""
+    def __init__(self):
+        self._evento = threading.Event()
+    def cancelar(self) -> None:
+        self._evento.set()
+    @property
+    def cancelado(self) -> bool:
+        return self._evento.is_set()
+
+class BusquedaAbortada(Exception):
+    """
+    La búsqueda se cortó antes de terminar (no es "sin solución").
+    - motivo: MAX_EXPANSIONES | DEADLINE | CANCELADO | MEMORIA
+    - cota_f: mayor f desencolado (con h consistente, cota inferior del óptimo)
+    - mejor_estado / mejor_h: nodo expandido más cercano a la meta según h
+    - camino_parcial: camino desde el inicio hasta mejor_estado
+    """
+    def __init__(self, motivo: str, expandidos: int, cota_f: float,
+                 mejor_estado=None, mejor_h: float = float("inf"),
+                 camino_parcial: Optional[List] = None):
+        super().__init__(f"búsqueda abortada ({motivo}) tras {expandidos} expansiones")
+        self.motivo = motivo
+        self.expandidos = expandidos
+        self.cota_f = cota_f
+        self.mejor_estado = mejor_estado
+        self.mejor_h = mejor_h
+        self.camino_parcial = camino_parcial
+
+class ControlBusqueda:
+    def __init__(self, max_expansiones: Optional[int] = None, deadline_ms: Optional[float] = None,
+                 cancelar: Optional[TokenCancelacion] = None):
+        self.max_expansiones = max_expansiones
+        self.limite_t = (time.perf_counter() + deadline_ms / 1000.0) if deadline_ms is not None else None
+        self.cancelar = cancelar
+        self.cota_f = float("-inf")
+        self.mejor_estado = None
+        self.mejor_h = float("inf")
+
+    def motivo(self, expandidos: int) -> Optional[str]:
+        """Motivo para cortar ya, o None si se puede seguir."""
+        if self.max_expansiones is not None and expandidos >= self.max_expansiones:
+            return MAX_EXPANSIONES
+        if self.cancelar is not None and self.cancelar.cancelado:
+            return CANCELADO
+        if self.limite_t is not None and time.perf_counter() > self.limite_t:
+            return DEADLINE
+        return None
+
+    def verificar(self, s, costo_h: float, costo_f: float, expandidos: int) -> Optional[str]:
+        """Registra la expansión de s (mejor nodo y cota f) y devuelve motivo() ."""
+        if costo_f > self.cota_f:
+            self.cota_f = costo_f
+        if costo_h < self.mejor_h:
+            self.mejor_h = costo_h
+            self.mejor_estado = s
+        return self.motivo(expandidos)
+
+    def abortar(self, motivo: str, expandidos: int,
+                camino_parcial: Optional[List] = None) -> BusquedaAbortada:
+        mejor = camino_parcial[-1] if camino_parcial else self.mejor_estado
+        return BusquedaAbortada(motivo, expandidos, self.cota_f, mejor, self.mejor_h, camino_parcial)
+
+def crear_control(max_expansiones: Optional[int] = None, deadline_ms: Optional[float] = None,
+                  cancelar: Optional[TokenCancelacion] = None) -> Optional[ControlBusqueda]:
+    if max_expansiones is None and deadline_ms is None and cancelar is None:
+        return None
+    return ControlBusqueda(max_expansiones, deadline_ms, cancelar)
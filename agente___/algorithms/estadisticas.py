@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Instrumentación opcional de los motores de búsqueda.
+
+    stats = EstadisticasBusqueda()
+    a_estrella(grafo, inicio, objetivo, h, stats=stats)
+    print(stats.como_dict())
+
+Sin stats (stats=None, el valor por defecto) los motores no miden nada: solo
+pagan una comparación con None en los puntos de medición.
+
+Contadores:
+- generados:      sucesores generados
+- expandidos:     nodos expandidos
+- reabiertos:     nodos que vuelven a la frontera con un g mejor (o se reexpanden)
+- pops_obsoletos: entradas desencoladas y descartadas (ya cerradas / g viejo)
+- pico_frontera:  tamaño máximo de la frontera (entradas, obsoletas incluidas)
+- pushes, decrementos: sucesores encolados y decrease-keys (solo HeapIndexado);
+  pops = expandidos + pops_obsoletos
+- t_h, t_sucesores: segundos dentro de h y dentro de la generación de sucesores
+"""
+from __future__ import annotations
+import json, time
+from typing import Callable, Dict, Iterable, Optional
+
+class EstadisticasBusqueda:
+    def __init__(self, traza: Optional[Callable[[dict], None]] = None, muestreo: int = 1000):
+        # traza: recibe un evento (dict) cada `muestreo` expansiones
+        self.traza = traza
+        self.muestreo = max(1, int(muestreo))
+        self.generados = 0
+        self.expandidos = 0
+        self.reabiertos = 0
+        self.pops_obsoletos = 0
+        self.pico_frontera = 0
+        self.pushes = 0
+        self.decrementos = 0
+        self.t_h = 0.0
+        self.t_sucesores = 0.0
+
+    # --- envoltorios con cronómetro ---
+    def medir_h(self, h: Callable) -> Callable:
+        """Devuelve h cronometrada (incluida su forma incremental h.update si existe)."""
+        def h_medida(s):
+            t0 = time.perf_counter()
+            v = h(s)
+            self.t_h += time.perf_counter() - t0
+            return v
+        update = getattr(h, "update", None)
+        if update is not None:
+            def update_medido(*args):
+                t0 = time.perf_counter()
+                v = update(*args)
+                self.t_h += time.perf_counter() - t0
+                return v
+            h_medida.update = update_medido
+        return h_medida
+
+    def medir_sucesores(self, sucesores: Callable[..., Iterable]) -> Callable[..., list]:
+        """Envuelve un generador de sucesores; lo materializa para medir su tiempo real."""
+        def sucesores_medidos(*args):
+            t0 = time.perf_counter()
+            lista = list(sucesores(*args))
+            self.t_sucesores += time.perf_counter() - t0
+            self.generados += len(lista)
+            return lista
+        return sucesores_medidos
+
+    def medir_grafo(self, grafo) -> "GrafoMedido":
+        return GrafoMedido(grafo, self)
+
+    # --- eventos ---
+    def al_expandir(self, estado, costo_g: float = 0.0, costo_f: float = 0.0, frontera: int = 0) -> None:
+        self.expandidos += 1
+        if frontera > self.pico_frontera:
+            self.pico_frontera = frontera
+        if self.traza is not None and self.expandidos % self.muestreo == 0:
+            self.traza({
+                "expandidos": self.expandidos, "generados": self.generados,
+                "frontera": frontera, "g": costo_g, "f": costo_f, "estado": estado,
+            })
+
+    def como_dict(self) -> Dict[str, float]:
+        return {
+            "generados": self.generados,
+            "reabiertos": self.reabiertos,
+            "pops_obsoletos": self.pops_obsoletos,
+            "pico_frontera": self.pico_frontera,
+            "pushes": self.pushes,
+            "pops": self.expandidos + self.pops_obsoletos,
+            "decrementos": self.decrementos,
+            "ms_h": self.t_h * 1000.0,
+            "ms_sucesores": self.t_sucesores * 1000.0,
+        }
+
+class GrafoMedido:
+    """Envuelve un grafo: cronometra get()/expandir() y cuenta los sucesores generados.
+    El resto de atributos (hueco, movimiento, n...) se reenvían al grafo base."""
+    def __init__(self, base, stats: EstadisticasBusqueda):
+        self.base = base
+        self.stats = stats
+        if callable(getattr(base, "expandir", None)):
+            self.expandir = stats.medir_sucesores(base.expandir)
+    def get(self, s, default=None):
+        t0 = time.perf_counter()
+        sucesores = self.base.get(s, default)
+        self.stats.t_sucesores += time.perf_counter() - t0
+        if sucesores:
+            self.stats.generados += len(sucesores)
+        return sucesores
+    def __getitem__(self, s):
+        return self.base[s]  # sin medir: lo usa get_costo al final, no la búsqueda
+    def __contains__(self, s):
+        return s in self.base
+    def __getattr__(self, nombre):
+        return getattr(self.base, nombre)
+
+def traza_jsonl(f) -> Callable[[dict], None]:
+    """Traza que escribe cada evento como una línea JSON en el archivo abierto f."""
+    def escribir(evento: dict) -> None:
+        f.write(json.dumps(evento, default=str) + "\n")
+    return escribir
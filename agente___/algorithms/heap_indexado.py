@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Heap binario indexado (estado -> posición) con decrease-key real.
+
+Con heapq, mejorar el g de un nodo obliga a encolar otra entrada y descartar
+la vieja al desencolarla; con costos ponderados o heurísticas inconsistentes
+el heap llega a tener varias entradas por nodo. Aquí cada estado tiene UNA
+sola entrada y actualizar() la sube en el heap en O(log n).
+
+    frontera = HeapIndexado()
+    frontera.actualizar(f, s)       # encola s o baja su clave si f es menor
+    f, s = frontera.pop()
+
+Las claves pueden ser cualquier valor comparable, p.ej. (f, estado) para
+desempatar igual que heapq. Contadores: pushes, pops, decrementos
+(decrease-key) y pico (tamaño máximo).
+"""
+from __future__ import annotations
+from typing import Dict, Hashable, List, Tuple
+
+class HeapIndexado:
+    def __init__(self):
+        self._claves: list = []
+        self._items: List[Hashable] = []
+        self._pos: Dict[Hashable, int] = {}
+        self.pushes = 0
+        self.pops = 0
+        self.decrementos = 0
+        self.pico = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item) -> bool:
+        return item in self._pos
+
+    def clave(self, item) -> object:
+        return self._claves[self._pos[item]]
+
+    def actualizar(self, clave, item) -> bool:
+        """Encola item o baja su clave (decrease-key). False si ya tenía una clave <= clave."""
+        i = self._pos.get(item)
+        if i is None:
+            i = len(self._items)
+            self._claves.append(clave)
+            self._items.append(item)
+            self._pos[item] = i
+            self.pushes += 1
+            if i + 1 > self.pico:
+                self.pico = i + 1
+        elif clave < self._claves[i]:
+            self._claves[i] = clave
+            self.decrementos += 1
+        else:
+            return False
+        self._subir(i)
+        return True
+
+    def pop(self) -> Tuple[object, Hashable]:
+        """(clave, item) de menor clave."""
+        claves, items = self._claves, self._items
+        if not items:
+            raise IndexError("pop de un heap vacío")
+        clave, item = claves[0], items[0]
+        ultima_clave, ultimo = claves.pop(), items.pop()
+        del self._pos[item]
+        if items:
+            claves[0], items[0] = ultima_clave, ultimo
+            self._pos[ultimo] = 0
+            self._bajar(0)
+        self.pops += 1
+        return clave, item
+
+    def _subir(self, i: int) -> None:
+        claves, items, pos = self._claves, self._items, self._pos
+        clave, item = claves[i], items[i]
+        while i > 0:
+            p = (i - 1) >> 1
+            if claves[p] <= clave:
+                break
+            claves[i], items[i] = claves[p], items[p]
+            pos[items[i]] = i
+            i = p
+        claves[i], items[i] = clave, item
+        pos[item] = i
+
+    def _bajar(self, i: int) -> None:
+        claves, items, pos = self._claves, self._items, self._pos
+        n = len(items)
+        clave, item = claves[i], items[i]
+        while True:
+            hijo = 2 * i + 1
+            if hijo >= n:
+                break
+            if hijo + 1 < n and claves[hijo + 1] < claves[hijo]:
+                hijo += 1
+            if claves[hijo] >= clave:
+                break
+            claves[i], items[i] = claves[hijo], items[hijo]
+            pos[items[i]] = i
+            i = hijo
+        claves[i], items[i] = clave, item
+        pos[item] = i
@@ -46,8 +46,11 @@ def heuristica_sld_a_objetivo(objetivo: str) -> Callable[[str], float]:  #sld ma
 
 # --- Heurísticas para Sliding Tile (n×n) ------------------------------------
 from typing import Tuple, Callable, Dict, List
+from agente___.algorithms.npuzzle_utils import desempaquetar_estado
 
 EstadoST = Tuple[int, ...]  # p.ej. (1,2,3,4,5,6,7,8,0) para 3x3
+# Las h de sliding tile aceptan también estados empaquetados en un int
+# (npuzzle_utils.empaquetar_estado); el goal de la factory va siempre como tupla.
 
 def _n_from_state(s: EstadoST) -> int:
     import math
@@ -62,84 +65,214 @@ def _goal_pos_map(goal: EstadoST) -> Dict[int, Tuple[int,int]]:
     n = _n_from_state(goal)
     return {v: _rc(i, n) for i, v in enumerate(goal)}
 
+def _tabla_distancias_ficha(goal: EstadoST) -> List[List[int]]:
+    """dist[v][idx] = distancia Manhattan de la ficha v en la casilla idx a su casilla
+    en goal (fila de ceros para el hueco). Se arma una vez por goal, sea cual sea."""
+    n = _n_from_state(goal)
+    goal_pos = _goal_pos_map(goal)
+    dist = [[0] * (n * n) for _ in range(n * n)]
+    for v, (rg, cg) in goal_pos.items():
+        if v == 0:
+            continue
+        fila = dist[v]
+        for idx in range(n * n):
+            r, c = _rc(idx, n)
+            fila[idx] = abs(r - rg) + abs(c - cg)
+    return dist
+
+# --- Forma incremental (delta) ---------------------------------------------
+# Las factories de sliding tile devuelven h(s) y además exponen
+#     h.update(parent_h, moved_tile, from_idx, to_idx, hijo) -> h(hijo)
+# donde moved_tile pasó de from_idx a to_idx (el hueco hizo el camino inverso).
+# Los motores de búsqueda la usan si existe para no reescanear todo el tablero.
+# Hamming y Manhattan no miran el resto del tablero (hijo es opcional);
+# conflicto lineal y PDB sí, y en ellas hijo es obligatorio.
+
 # --- Hamming: piezas mal colocadas (no cuenta el 0) ---
 def h_hamming_factory(goal: EstadoST) -> Callable[[EstadoST], float]:
+    n = _n_from_state(goal)
     def h(s: EstadoST) -> float:
+        if isinstance(s, int):
+            s = desempaquetar_estado(s, n)
         return sum(1 for i,(a,b) in enumerate(zip(s, goal)) if a != 0 and a != b)
+
+    def update(parent_h: float, moved_tile: int, from_idx: int, to_idx: int, hijo=None) -> float:
+        return parent_h - (moved_tile != goal[from_idx]) + (moved_tile != goal[to_idx])
+
+    h.update = update
     return h
 
 # --- Manhattan total: suma |Δfila|+|Δcol| para cada pieza (≠0) ---
 def h_manhattan_factory(goal: EstadoST) -> Callable[[EstadoST], float]:
-    goal_pos = _goal_pos_map(goal)
+    dist = _tabla_distancias_ficha(goal)   # dist[v][idx]: sin divmod ni abs por ficha
+    n = _n_from_state(goal)
     def h(s: EstadoST) -> float:
-        n = _n_from_state(s)
+        if isinstance(s, int):
+            s = desempaquetar_estado(s, n)
         total = 0
         for i, v in enumerate(s):
-            if v == 0: 
-                continue
-            r, c = _rc(i, n)
-            rg, cg = goal_pos[v]
-            total += abs(r - rg) + abs(c - cg)
+            total += dist[v][i]
         return float(total)
+
+    # O(1): solo cambia la contribución de la ficha movida
+    def update(parent_h: float, moved_tile: int, from_idx: int, to_idx: int, hijo=None) -> float:
+        d = dist[moved_tile]
+        return parent_h - d[from_idx] + d[to_idx]
+
+    h.update = update
     return h
 
-# --- Manhattan + Conflicto lineal (fila y columna), suma +2 por conflicto ---
-def h_manhattan_linear_conflict_factory(goal: EstadoST) -> Callable[[EstadoST], float]:
+# --- Manhattan + Conflicto lineal (fila y columna) ---
+# En cada línea, las fichas que pertenecen a ella (en el goal) y están en orden
+# invertido obligan a sacar fichas de la línea: cada ficha sacada suma 2. El
+# valor correcto es el MÍNIMO de fichas a sacar = fichas en línea - LIS de sus
+# posiciones destino (contar pares invertidos lo sobreestima, p.ej. 3 2 1 da 3
+# pares pero basta sacar 2 fichas).
+#
+# Una línea se codifica con un dígito por casilla en base n+1: la posición
+# destino de la ficha dentro de la línea, o n si la ficha no es de esa línea
+# (o es el hueco). _tabla_conflictos(n)[codigo] guarda las fichas a sacar, y
+# aporte[idx][v] = dígito de la ficha v en la casilla idx ya multiplicado por
+# su peso, así el código de una línea es una suma de n consultas.
+# La tabla tiene (n+1)^n entradas: pasado N_MAXIMO_TABLA_CONFLICTOS (7^6 =
+# 117649) se calcula la LIS de cada línea al vuelo con los dígitos sin peso.
+N_MAXIMO_TABLA_CONFLICTOS = 6
+_TABLAS_CONFLICTO: Dict[int, List[int]] = {}
+
+def _fichas_a_sacar(destinos: List[int]) -> int:
+    """len(destinos) - largo de la subsecuencia creciente más larga (LIS)."""
+    colas: List[int] = []
+    for d in destinos:
+        lo, hi = 0, len(colas)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if colas[mid] < d:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == len(colas):
+            colas.append(d)
+        else:
+            colas[lo] = d
+    return len(destinos) - len(colas)
+
+def _tabla_conflictos(n: int) -> List[int]:
+    if n > N_MAXIMO_TABLA_CONFLICTOS:
+        raise ValueError(f"Tabla de conflictos solo hasta n={N_MAXIMO_TABLA_CONFLICTOS} (n={n})")
+    tabla = _TABLAS_CONFLICTO.get(n)
+    if tabla is None:
+        base = n + 1
+        tabla = []
+        for codigo in range(base ** n):
+            digitos = []
+            for _ in range(n):
+                codigo, d = divmod(codigo, base)
+                digitos.append(d)
+            digitos.reverse()
+            tabla.append(_fichas_a_sacar([d for d in digitos if d < n]))
+        _TABLAS_CONFLICTO[n] = tabla
+    return tabla
+
+def _aportes_conflicto(goal: EstadoST, pesos: bool = True) -> Tuple[List[List[int]], List[List[int]]]:
+    """aporte_fila[idx][v], aporte_col[idx][v] (ver comentario de arriba); pesos=False: solo el dígito."""
+    n = _n_from_state(goal)
     goal_pos = _goal_pos_map(goal)
+    base = n + 1 if pesos else 1
+    aporte_fila: List[List[int]] = []
+    aporte_col: List[List[int]] = []
+    for idx in range(n * n):
+        r, c = _rc(idx, n)
+        fila, col = [0] * (n * n), [0] * (n * n)
+        for v in range(n * n):
+            rg, cg = goal_pos[v]
+            d_fila = cg if (v != 0 and rg == r) else n
+            d_col = rg if (v != 0 and cg == c) else n
+            fila[v] = d_fila * base ** (n - 1 - c)
+            col[v] = d_col * base ** (n - 1 - r)
+        aporte_fila.append(fila)
+        aporte_col.append(col)
+    return aporte_fila, aporte_col
+
+def h_manhattan_linear_conflict_factory(goal: EstadoST) -> Callable[[EstadoST], float]:
+    n = _n_from_state(goal)
+    dist = _tabla_distancias_ficha(goal)
+    con_tabla = n <= N_MAXIMO_TABLA_CONFLICTOS
+    tabla = _tabla_conflictos(n) if con_tabla else None
+    aporte_fila, aporte_col = _aportes_conflicto(goal, pesos=con_tabla)
+    filas = [tuple(r * n + c for c in range(n)) for r in range(n)]
+    cols = [tuple(r * n + c for r in range(n)) for c in range(n)]
+    # fila/columna de cada casilla y de la casilla destino de cada ficha
+    fila_de = [idx // n for idx in range(n * n)]
+    col_de = [idx % n for idx in range(n * n)]
+    fila_goal, col_goal = [0] * (n * n), [0] * (n * n)
+    for idx, v in enumerate(goal):
+        fila_goal[v], col_goal[v] = fila_de[idx], col_de[idx]
+
     def _manhattan(s: EstadoST) -> int:
-        n = _n_from_state(s)
         m = 0
         for i, v in enumerate(s):
-            if v == 0: 
-                continue
-            r, c = _rc(i, n)
-            rg, cg = goal_pos[v]
-            m += abs(r - rg) + abs(c - cg)
+            m += dist[v][i]
         return m
 
-    def _row_conflicts(s: EstadoST) -> int:
-        n = _n_from_state(s)
-        confl = 0
-        for r in range(n):
-            row_tiles = []
-            for c in range(n):
-                v = s[r*n + c]
-                if v != 0 and goal_pos[v][0] == r:
-                    row_tiles.append((c, goal_pos[v][1]))
-            for i in range(len(row_tiles)):
-                for j in range(i+1, len(row_tiles)):
-                    cg_i = row_tiles[i][1]
-                    cg_j = row_tiles[j][1]
-                    if cg_i > cg_j:
-                        confl += 1
-        return confl
-
-    def _col_conflicts(s: EstadoST) -> int:
-        n = _n_from_state(s)
-        confl = 0
-        for c in range(n):
-            col_tiles = []
-            for r in range(n):
-                v = s[r*n + c]
-                if v != 0 and goal_pos[v][1] == c:
-                    col_tiles.append((r, goal_pos[v][0]))
-            for i in range(len(col_tiles)):
-                for j in range(i+1, len(col_tiles)):
-                    rg_i = col_tiles[i][1]
-                    rg_j = col_tiles[j][1]
-                    if rg_i > rg_j:
-                        confl += 1
-        return confl
+    def _conflictos(s: EstadoST, celdas: Tuple[int, ...], aporte: List[List[int]],
+                    idx: int = -1, v: int = 0) -> Tuple[int, int]:
+        """(fichas a sacar en la línea de s, ídem con v en la casilla idx)."""
+        if con_tabla:
+            codigo = 0
+            for i in celdas:
+                codigo += aporte[i][s[i]]
+            if idx < 0:
+                return tabla[codigo], tabla[codigo]
+            return tabla[codigo], tabla[codigo - aporte[idx][s[idx]] + aporte[idx][v]]
+        destinos = [aporte[i][s[i]] for i in celdas]
+        actual = _fichas_a_sacar([d for d in destinos if d < n])
+        if idx < 0:
+            return actual, actual
+        destinos[celdas.index(idx)] = aporte[idx][v]
+        return actual, _fichas_a_sacar([d for d in destinos if d < n])
 
     def h(s: EstadoST) -> float:
-        m = _manhattan(s)
-        lc = _row_conflicts(s) + _col_conflicts(s)
-        return float(m + 2 * lc)
+        if isinstance(s, int):
+            s = desempaquetar_estado(s, n)
+        lc = 0
+        for celdas in filas:
+            lc += _conflictos(s, celdas, aporte_fila)[0]
+        for celdas in cols:
+            lc += _conflictos(s, celdas, aporte_col)[0]
+        return float(_manhattan(s) + 2 * lc)
+
+    # O(n): un movimiento vertical solo puede cambiar una fila (la columna conserva
+    # el orden de sus fichas): la de origen si la ficha es de esa fila, o la de
+    # destino si es de esa; horizontal, lo mismo con columnas. El código previo
+    # de la línea sale del nuevo cambiando el aporte de una sola casilla.
+    def update(parent_h: float, moved_tile: int, from_idx: int, to_idx: int, hijo) -> float:
+        d = dist[moved_tile]
+        dm = d[to_idx] - d[from_idx]
+        linea0, linea1 = fila_de[from_idx], fila_de[to_idx]
+        if linea0 != linea1:
+            aporte, destino, lineas = aporte_fila, fila_goal[moved_tile], filas
+        else:
+            linea0, linea1 = col_de[from_idx], col_de[to_idx]
+            aporte, destino, lineas = aporte_col, col_goal[moved_tile], cols
+        if destino != linea0 and destino != linea1:
+            return parent_h + dm            # la ficha no cuenta en ninguna de las dos líneas
+        if isinstance(hijo, int):
+            hijo = desempaquetar_estado(hijo, n)
+        if destino == linea0:               # sale de su línea (en hijo, from_idx es el hueco)
+            nuevo, viejo = _conflictos(hijo, lineas[linea0], aporte, from_idx, moved_tile)
+        else:                               # entra en su línea
+            nuevo, viejo = _conflictos(hijo, lineas[linea1], aporte, to_idx, 0)
+        return parent_h + dm + 2 * (nuevo - viejo)
+
+    h.update = update
     return h
 
 def h_gaschnig_factory(goal: EstadoST) -> Callable[[EstadoST], float]:
     goal_index = {v: i for i, v in enumerate(goal)}
+    n = _n_from_state(goal)
     def h(s: EstadoST) -> float:
+        if isinstance(s, int):
+            s = desempaquetar_estado(s, n)
         if s == goal:
             return 0.0
         arr = list(s)
@@ -161,3 +294,145 @@ def h_gaschnig_factory(goal: EstadoST) -> Callable[[EstadoST], float]:
             swaps += 1
         return float(swaps)
     return h
+
+# --- Walking Distance (WD) ---------------------------------------------------
+# Se ignoran las columnas: el estado "vertical" es M[r][k] = cuántas fichas de
+# la fila r tienen su destino en la fila k, más la fila del hueco. Un
+# movimiento vertical pasa una ficha de la fila vecina a la del hueco. La
+# distancia BFS desde el goal en ese espacio (24964 estados en 4x4) es una
+# cota de los movimientos verticales; lo mismo con columnas para los
+# horizontales, y WD = vertical + horizontal (admisible, y en general
+# domina a Manhattan).
+#
+# La tabla solo depende de n y de la fila del hueco en el goal: las columnas
+# usan la de (n, columna del hueco). Se guarda en agente___/data/cache.
+import logging, os, struct, sys
+from array import array
+from agente___.algorithms.archivo_tablas import DIR_CACHE, guardar_tabla, leer_cabecera
+
+_log = logging.getLogger(__name__)
+_MAGIC_WD = b"NDWD"
+_VERSION_WD = 1
+N_MAXIMO_WD = 4         # en 5x5 el espacio de M ya no cabe en un dict en memoria
+_TABLAS_WD: Dict[Tuple[int, int], Dict[int, int]] = {}   # memo por (n, fila del hueco)
+
+def _bits_wd(n: int) -> int:
+    return max(1, n.bit_length())          # cada M[r][k] vale a lo sumo n
+
+def construir_tabla_wd(n: int, fila_hueco: int) -> Dict[int, int]:
+    """BFS sobre M codificada en un int: M[r][k] en los bits r*n+k, fila del hueco arriba."""
+    if n > N_MAXIMO_WD:
+        raise ValueError(f"Walking distance solo hasta {N_MAXIMO_WD}x{N_MAXIMO_WD} (n={n})")
+    b = _bits_wd(n)
+    mask = (1 << b) - 1
+    sh_hueco = b * n * n
+    inicio = 0
+    for r in range(n):
+        inicio |= (n - (r == fila_hueco)) << (b * (r * n + r))
+    inicio |= fila_hueco << sh_hueco
+    dist = {inicio: 0}
+    frontera = [inicio]
+    d = 0
+    while frontera:
+        d += 1
+        siguiente = []
+        for codigo in frontera:
+            fila = codigo >> sh_hueco
+            base = codigo - (fila << sh_hueco)
+            for vecina in (fila - 1, fila + 1):
+                if not 0 <= vecina < n:
+                    continue
+                for k in range(n):
+                    sh_origen = b * (vecina * n + k)
+                    if (base >> sh_origen) & mask == 0:
+                        continue
+                    # una ficha con destino k pasa de la fila vecina a la del hueco
+                    v = base - (1 << sh_origen) + (1 << (b * (fila * n + k))) + (vecina << sh_hueco)
+                    if v not in dist:
+                        dist[v] = d
+                        siguiente.append(v)
+        frontera = siguiente
+    return dist
+
+# Cabecera común (archivo_tablas) | códigos u64 | distancias u8
+
+def guardar_tabla_wd(ruta: str, n: int, fila_hueco: int, dist: Dict[int, int]) -> None:
+    meta = {"n": n, "fila_hueco": fila_hueco, "estados": len(dist)}
+    guardar_tabla(ruta, _MAGIC_WD, _VERSION_WD, meta,
+                  [struct.pack(f"<{len(dist)}Q", *dist.keys()), bytes(dist.values())])
+
+def cargar_tabla_wd(ruta: str) -> Tuple[dict, Dict[int, int]]:
+    with open(ruta, "rb") as f:
+        datos = f.read()
+    meta, inicio = leer_cabecera(datos, ruta, _MAGIC_WD, _VERSION_WD, "tabla WD")
+    m = meta["estados"]
+    codigos = array("Q")
+    codigos.frombytes(datos[inicio:inicio + 8 * m])
+    if sys.byteorder == "big":
+        codigos.byteswap()                 # el archivo es little endian
+    return meta, dict(zip(codigos, datos[inicio + 8 * m:inicio + 9 * m]))
+
+def tabla_wd(n: int, fila_hueco: int, directorio: str = DIR_CACHE) -> Dict[int, int]:
+    """Tabla WD de (n, fila del hueco en el goal): memoria -> disco -> BFS."""
+    clave = (n, fila_hueco)
+    dist = _TABLAS_WD.get(clave)
+    if dist is not None:
+        return dist
+    ruta = os.path.join(directorio, f"wd_v{_VERSION_WD}_n{n}_f{fila_hueco}.bin")
+    if os.path.exists(ruta):
+        _, dist = cargar_tabla_wd(ruta)
+    else:
+        _log.info("construyendo tabla de walking distance %s", ruta)
+        dist = construir_tabla_wd(n, fila_hueco)
+        guardar_tabla_wd(ruta, n, fila_hueco, dist)
+    _TABLAS_WD[clave] = dist
+    return dist
+
+def h_walking_distance_factory(goal: EstadoST) -> Callable[[EstadoST], float]:
+    """WD = tabla vertical[M de filas] + tabla horizontal[M de columnas]; tablas perezosas."""
+    n = _n_from_state(goal)
+    if n > N_MAXIMO_WD:
+        raise ValueError(f"Walking distance solo hasta {N_MAXIMO_WD}x{N_MAXIMO_WD} (n={n})")
+    goal_pos = _goal_pos_map(goal)
+    b = _bits_wd(n)
+    sh_hueco = b * n * n
+    rg0, cg0 = goal_pos[0]
+    tablas: List[Dict[int, int]] = []      # [verticales, horizontales] al primer uso
+    # aporte[idx][v]: +1 en M[fila(idx)][fila destino de v]; para el hueco, su fila
+    aporte_fila: List[List[int]] = []
+    aporte_col: List[List[int]] = []
+    for idx in range(n * n):
+        r, c = _rc(idx, n)
+        fila, col = [r << sh_hueco], [c << sh_hueco]
+        for v in range(1, n * n):
+            rg, cg = goal_pos[v]
+            fila.append(1 << (b * (r * n + rg)))
+            col.append(1 << (b * (c * n + cg)))
+        aporte_fila.append(fila)
+        aporte_col.append(col)
+
+    def h(s: EstadoST) -> float:
+        if isinstance(s, int):
+            s = desempaquetar_estado(s, n)
+        if not tablas:
+            tablas.append(tabla_wd(n, rg0))
+            tablas.append(tabla_wd(n, cg0))
+        codigo_fila = codigo_col = 0
+        for i, v in enumerate(s):
+            codigo_fila += aporte_fila[i][v]
+            codigo_col += aporte_col[i][v]
+        return float(tablas[0][codigo_fila] + tablas[1][codigo_col])
+    return h
+
+def h_maximo_factory(*factories: Callable) -> Callable[[EstadoST], Callable[[EstadoST], float]]:
+    """Combina heurísticas admisibles: h(s) = max(h_i(s)), también admisible."""
+    def factory(goal: EstadoST) -> Callable[[EstadoST], float]:
+        hs = [f(goal) for f in factories]
+        def h(s: EstadoST) -> float:
+            return max(hi(s) for hi in hs)
+        return h
+    return factory
+
+# max(WD, Manhattan + conflicto lineal): WD no ve conflictos dentro de una línea
+h_walking_distance_lc_factory = h_maximo_factory(h_walking_distance_factory,
+                                                 h_manhattan_linear_conflict_factory)
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Heurísticas vectorizadas (NumPy) para sliding tile n×n.
+
+Cada factory devuelve hb(S) donde S es un array 2-D uint8 de forma (N, n*n)
+con N estados (uno por fila) y hb(S) es un array float de N valores.
+Calculan lo mismo que sus versiones escalares de heuristics.py, pero con
+arrays precalculados de fila/columna del goal en lugar de goal_pos (dict).
+
+NumPy es opcional: sin él, las factories lanzan ImportError.
+"""
+from __future__ import annotations
+from typing import Callable, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # dependencia opcional
+    np = None
+
+from agente___.algorithms.heuristics import (
+    EstadoST, _n_from_state, _tabla_conflictos, _aportes_conflicto, N_MAXIMO_TABLA_CONFLICTOS
+)
+
+def _requiere_numpy() -> None:
+    if np is None:
+        raise ImportError("Las heurísticas por lotes necesitan NumPy (pip install numpy)")
+
+def a_matriz(estados: Sequence[EstadoST]):
+    """Lista de estados (tuplas) -> array (N, n*n) uint8."""
+    _requiere_numpy()
+    return np.asarray(estados, dtype=np.uint8)
+
+def _tablas_goal(goal: EstadoST):
+    """goal_fila[v], goal_col[v] para cada ficha v (arrays indexables con S)."""
+    n = _n_from_state(goal)
+    goal_fila = np.zeros(n * n, dtype=np.int16)
+    goal_col = np.zeros(n * n, dtype=np.int16)
+    for i, v in enumerate(goal):
+        goal_fila[v], goal_col[v] = divmod(i, n)
+    return n, goal_fila, goal_col
+
+def h_hamming_batch_factory(goal: EstadoST) -> Callable:
+    _requiere_numpy()
+    g = np.asarray(goal, dtype=np.uint8)
+    def hb(S):
+        return ((S != g) & (S != 0)).sum(axis=1).astype(np.float64)
+    return hb
+
+def h_manhattan_batch_factory(goal: EstadoST) -> Callable:
+    _requiere_numpy()
+    n, goal_fila, goal_col = _tablas_goal(goal)
+    filas = np.arange(n * n, dtype=np.int16) // n
+    cols = np.arange(n * n, dtype=np.int16) % n
+    def hb(S):
+        d = np.abs(goal_fila[S] - filas) + np.abs(goal_col[S] - cols)
+        d[S == 0] = 0
+        return d.sum(axis=1).astype(np.float64)
+    return hb
+
+def _fichas_a_sacar_lote(D):
+    """Por fila de D (destinos; n = no es de la línea): fichas - LIS, con DP O(n^2) vectorizada."""
+    n = D.shape[1]
+    validas = D < n
+    lis = np.zeros(D.shape, dtype=np.int16)
+    for j in range(n):
+        previas = validas[:, :j] & (D[:, :j] < D[:, j:j + 1])
+        mejor = np.where(previas, lis[:, :j], 0).max(axis=1, initial=0)
+        lis[:, j] = np.where(validas[:, j], mejor + 1, 0)
+    return validas.sum(axis=1) - lis.max(axis=1)
+
+def h_manhattan_linear_conflict_batch_factory(goal: EstadoST) -> Callable:
+    """Misma tabla de conflictos que la versión escalar: código de línea = suma de aportes.
+    Pasado N_MAXIMO_TABLA_CONFLICTOS, la LIS de cada línea se calcula por lotes."""
+    _requiere_numpy()
+    n = _n_from_state(goal)
+    manhattan = h_manhattan_batch_factory(goal)
+    celdas = np.arange(n * n)[None, :]
+    if n > N_MAXIMO_TABLA_CONFLICTOS:
+        digito_fila, digito_col = (np.asarray(a, dtype=np.int16)
+                                   for a in _aportes_conflicto(goal, pesos=False))
+
+        def hb_lis(S):
+            D_fila = digito_fila[celdas, S].reshape(-1, n)
+            D_col = digito_col[celdas, S].reshape(-1, n, n).transpose(0, 2, 1).reshape(-1, n)
+            lc = (_fichas_a_sacar_lote(D_fila).reshape(-1, n).sum(axis=1)
+                  + _fichas_a_sacar_lote(D_col).reshape(-1, n).sum(axis=1))
+            return manhattan(S) + 2.0 * lc
+        return hb_lis
+    tabla = np.asarray(_tabla_conflictos(n), dtype=np.int16)
+    aporte_fila, aporte_col = (np.asarray(a, dtype=np.int32) for a in _aportes_conflicto(goal))
+
+    def hb(S):
+        codigos_fila = aporte_fila[celdas, S].reshape(-1, n, n).sum(axis=2)
+        codigos_col = aporte_col[celdas, S].reshape(-1, n, n).sum(axis=1)
+        lc = tabla[codigos_fila].sum(axis=1) + tabla[codigos_col].sum(axis=1)
+        return manhattan(S) + 2.0 * lc
+    return hb
@@ -6,11 +6,27 @@ Algoritmos informados (Búsqueda Informada):
 
 Formato esperado del grafo ponderado: dict[str, dict[str, float]]
 Ambos retornan: (camino, costo_total, expandidos)
+
+Instrumentación: greedy_codicioso, a_estrella, ida_estrella y ara_estrella aceptan
+stats=EstadisticasBusqueda() (ver estadisticas.py); con stats=None no se mide nada.
+
+Corte cooperativo: todos los motores aceptan max_expansiones, deadline_ms y
+cancelar (TokenCancelacion). Al cortar lanzan BusquedaAbortada (ver control.py)
+con la mejor información parcial; ara_estrella, que es "anytime", en cambio
+devuelve la mejor solución hallada hasta ahí.
 """
 
-from heapq import heappush, heappop
+from collections import deque
+from heapq import heappush, heappop, heapify
 from typing import Dict, List, Tuple, Callable, Optional, Set
 
+from agente___.algorithms.estadisticas import EstadisticasBusqueda
+from agente___.algorithms.heap_indexado import HeapIndexado
+from agente___.algorithms.control import (
+    BusquedaAbortada, ControlBusqueda, TokenCancelacion, crear_control, MEMORIA
+)
+from agente___.environments.sliding_graph import codigo_movimiento
+
 Estado = str
 GrafoPonderado = Dict[Estado, Dict[Estado, float]]
 Path = List[Estado]
@@ -27,6 +43,9 @@ class GraphAdapter:
     def __contains__(self, s):
         # asume que cualquier estado válido puede consultarse
         return True
+    def __getattr__(self, nombre):
+        # reenvía atributos extra del grafo base (p.ej. SlidingLazyGraph.movimiento)
+        return getattr(self.base, nombre)
 
 def _reconstruir_camino(padre: Dict[Estado, Estado], objetivo: Estado) -> Path:
     camino: Path = [objetivo]
@@ -38,19 +57,449 @@ def _reconstruir_camino(padre: Dict[Estado, Estado], objetivo: Estado) -> Path:
     return camino
 
 
+def _verificar(control: ControlBusqueda, s: Estado, costo_h: float, costo_f: float,
+               expandidos: int, padre, reconstruir=_reconstruir_camino) -> None:
+    """Lanza BusquedaAbortada si el control pide cortar (camino parcial vía padre)."""
+    motivo = control.verificar(s, costo_h, costo_f, expandidos)
+    if motivo is not None:
+        raise control.abortar(motivo, expandidos, reconstruir(padre, control.mejor_estado))
+
+
+def _movimiento(s, v) -> Tuple[int, int, int]:
+    """(ficha, desde, hasta) del paso s -> v en sliding tile: la ficha ocupa el hueco de s.
+    Para estados empaquetados se usa grafo.movimiento (SlidingLazyGraph conoce n)."""
+    hasta = s.index(0)
+    desde = v.index(0)
+    return s[desde], desde, hasta
+
+
+# --- Camino rápido para sliding tile -------------------------------------------
+# Si el grafo ofrece expandir(s, hueco, hueco_padre) (SlidingLazyGraph), los
+# motores guardan la posición del hueco junto a cada estado, usan las tablas de
+# movimientos precalculadas y no generan el movimiento que deshace el anterior.
+# Todas las aristas cuestan 1.
+
+def _es_sliding(grafo) -> bool:
+    return callable(getattr(grafo, "expandir", None)) and callable(getattr(grafo, "hueco", None))
+
+# En vez de padre[v] = s (un estado por nodo), cada nodo guarda el código de 2
+# bits del movimiento que lo generó (ver sliding_graph.MOVIMIENTOS), junto con
+# su g en A*: registro[v] = (g << 2) | codigo. El camino se rehace deshaciendo
+# movimientos desde la meta hasta el inicio con grafo.mover
+# (grafo.cadena_movimientos(camino) lo da como "UDLR...").
+
+def _codigos_hasta(grafo, registro: Dict[Estado, int], inicio: Estado, objetivo: Estado) -> List[int]:
+    """Códigos de movimiento de inicio a objetivo según registro."""
+    codigos: List[int] = []
+    s, hueco = objetivo, grafo.hueco(objetivo)
+    while s != inicio:
+        codigo = registro[s] & 3
+        codigos.append(codigo)
+        s, hueco = grafo.mover(s, hueco, codigo ^ 1)   # deshacer el paso
+    codigos.reverse()
+    return codigos
+
+def _reconstruir_sliding(grafo, registro: Dict[Estado, int], inicio: Estado, objetivo: Estado) -> Path:
+    """Camino de estados reproduciendo los movimientos desde el inicio."""
+    camino: Path = [inicio]
+    s, hueco = inicio, grafo.hueco(inicio)
+    for codigo in _codigos_hasta(grafo, registro, inicio, objetivo):
+        s, hueco = grafo.mover(s, hueco, codigo)
+        camino.append(s)
+    return camino
+
+
+def _greedy_sliding(grafo, inicio, objetivo, h, stats=None, control=None) -> Tuple[Optional[Path], float, int]:
+    h_update = getattr(h, "update", None)
+    frontera: List[Tuple[float, Estado, int, int]] = []
+    heappush(frontera, (h(inicio), inicio, grafo.hueco(inicio), -1))
+    visitado: Set[Estado] = set()
+    movida: Dict[Estado, int] = {inicio: 0}   # código del movimiento que generó cada nodo
+    reconstruir = lambda reg, meta: _reconstruir_sliding(grafo, reg, inicio, meta)
+    expandidos = 0
+
+    while frontera:
+        costo_h, s, hueco, hueco_padre = heappop(frontera)
+        if s in visitado:
+            if stats is not None:
+                stats.pops_obsoletos += 1
+            continue
+        visitado.add(s)
+        expandidos += 1
+        if stats is not None:
+            stats.al_expandir(s, 0.0, costo_h, len(frontera) + 1)
+
+        if s == objetivo:
+            camino = reconstruir(movida, s)
+            return camino, float(len(camino) - 1), expandidos
+        if control is not None:
+            _verificar(control, s, costo_h, costo_h, expandidos, movida, reconstruir)
+
+        for v, hueco_v, ficha in grafo.expandir(s, hueco, hueco_padre):
+            if v in visitado:
+                continue
+            if v not in movida:
+                movida[v] = codigo_movimiento(hueco, hueco_v)
+            if h_update is not None:
+                costo_h_v = h_update(costo_h, ficha, hueco_v, hueco, v)
+            else:
+                costo_h_v = h(v)
+            if stats is not None:
+                stats.pushes += 1
+            heappush(frontera, (costo_h_v, v, hueco_v, hueco))
+
+    return None, float("inf"), expandidos
+
+
+def _a_estrella_sliding(grafo, inicio, objetivo, h, stats=None, control=None) -> Tuple[Optional[Path], float, int]:
+    h_update = getattr(h, "update", None)
+    frontera: List[Tuple[float, Estado, int, int]] = []
+    registro: Dict[Estado, int] = {inicio: 0}   # (g << 2) | código del movimiento
+    reconstruir = lambda reg, meta: _reconstruir_sliding(grafo, reg, inicio, meta)
+    cerrado: Set[Estado] = set()
+    expandidos = 0
+
+    heappush(frontera, (h(inicio), inicio, grafo.hueco(inicio), -1))
+
+    while frontera:
+        costo_f, s, hueco, hueco_padre = heappop(frontera)
+        if s in cerrado:
+            if stats is not None:
+                stats.pops_obsoletos += 1
+            continue
+        cerrado.add(s)
+        expandidos += 1
+
+        g_s = registro[s] >> 2
+        if stats is not None:
+            stats.al_expandir(s, g_s, costo_f, len(frontera) + 1)
+        if s == objetivo:
+            return reconstruir(registro, s), float(g_s), expandidos
+
+        costo_h_s = costo_f - g_s
+        if control is not None:
+            _verificar(control, s, costo_h_s, costo_f, expandidos, registro, reconstruir)
+        nuevo_g = g_s + 1
+        for v, hueco_v, ficha in grafo.expandir(s, hueco, hueco_padre):
+            if v in cerrado:
+                continue
+            registro_v = registro.get(v)
+            if registro_v is None or nuevo_g < registro_v >> 2:
+                if stats is not None:
+                    stats.pushes += 1
+                    if registro_v is not None:
+                        stats.reabiertos += 1
+                registro[v] = (nuevo_g << 2) | codigo_movimiento(hueco, hueco_v)
+                if h_update is not None:
+                    costo_h = h_update(costo_h_s, ficha, hueco_v, hueco, v)
+                else:
+                    costo_h = h(v)
+                heappush(frontera, (nuevo_g + costo_h, v, hueco_v, hueco))
+
+    return None, float("inf"), expandidos
+
+
+class FronteraCubetas:
+    """
+    Cola de prioridad por cubetas indexadas por f entero (costos unitarios):
+    push y pop O(1) amortizados, sin comparar estados entre sí.
+    Desempate dentro de una misma f:
+    - "max_g": mayor g primero (menor h: más cerca de la meta), LIFO entre iguales
+    - "lifo":  el último encolado primero
+    - "fifo":  el primero encolado primero
+    """
+    POLITICAS = ("max_g", "lifo", "fifo")
+
+    def __init__(self, desempate: str = "max_g"):
+        if desempate not in self.POLITICAS:
+            raise ValueError(f"Desempate no soportado: {desempate} (opciones: {', '.join(self.POLITICAS)})")
+        self.desempate = desempate
+        self._cubetas: list = []   # _cubetas[f]: deque (fifo), list (lifo) o list de lists por g (max_g)
+        self._min_f = 0            # ninguna cubeta por debajo tiene elementos
+        self._tam = 0
+
+    def push(self, costo_f: float, costo_g: float, item) -> None:
+        k = int(costo_f)
+        if k != costo_f:
+            raise ValueError(f"FronteraCubetas necesita f enteros (f={costo_f})")
+        cubetas = self._cubetas
+        while len(cubetas) <= k:
+            cubetas.append(deque() if self.desempate == "fifo" else [])
+        if self.desempate == "max_g":
+            por_g = cubetas[k]
+            g = int(costo_g)
+            while len(por_g) <= g:
+                por_g.append([])
+            por_g[g].append(item)
+        else:
+            cubetas[k].append(item)
+        if k < self._min_f:
+            self._min_f = k
+        self._tam += 1
+
+    def pop(self) -> Tuple[int, object]:
+        """(f, item) de menor f según la política de desempate."""
+        if not self._tam:
+            raise IndexError("pop de una frontera vacía")
+        cubetas = self._cubetas
+        k = self._min_f
+        while not cubetas[k]:
+            k += 1
+        self._min_f = k
+        cubeta = cubetas[k]
+        if self.desempate == "max_g":
+            item = cubeta[-1].pop()
+            while cubeta and not cubeta[-1]:   # recorta g vacíos: cubeta[-1] = mayor g con elementos
+                cubeta.pop()
+        elif self.desempate == "fifo":
+            item = cubeta.popleft()
+        else:
+            item = cubeta.pop()
+        self._tam -= 1
+        return k, item
+
+    def __len__(self) -> int:
+        return self._tam
+
+
+def _a_estrella_cubetas(grafo, inicio, objetivo, h, desempate, stats=None,
+                        control=None) -> Tuple[Optional[Path], float, int]:
+    """Igual que _a_estrella_sliding pero con FronteraCubetas (f entero) en vez del heap."""
+    h_update = getattr(h, "update", None)
+    frontera = FronteraCubetas(desempate)
+    registro: Dict[Estado, int] = {inicio: 0}   # (g << 2) | código del movimiento
+    reconstruir = lambda reg, meta: _reconstruir_sliding(grafo, reg, inicio, meta)
+    cerrado: Set[Estado] = set()
+    expandidos = 0
+
+    frontera.push(h(inicio), 0.0, (inicio, grafo.hueco(inicio), -1))
+
+    while frontera:
+        costo_f, (s, hueco, hueco_padre) = frontera.pop()
+        if s in cerrado:
+            if stats is not None:
+                stats.pops_obsoletos += 1
+            continue
+        cerrado.add(s)
+        expandidos += 1
+
+        g_s = registro[s] >> 2
+        if stats is not None:
+            stats.al_expandir(s, g_s, costo_f, len(frontera) + 1)
+        if s == objetivo:
+            return reconstruir(registro, s), float(g_s), expandidos
+
+        costo_h_s = costo_f - g_s
+        if control is not None:
+            _verificar(control, s, costo_h_s, costo_f, expandidos, registro, reconstruir)
+        nuevo_g = g_s + 1
+        for v, hueco_v, ficha in grafo.expandir(s, hueco, hueco_padre):
+            if v in cerrado:
+                continue
+            registro_v = registro.get(v)
+            if registro_v is None or nuevo_g < registro_v >> 2:
+                if stats is not None:
+                    stats.pushes += 1
+                    if registro_v is not None:
+                        stats.reabiertos += 1
+                registro[v] = (nuevo_g << 2) | codigo_movimiento(hueco, hueco_v)
+                if h_update is not None:
+                    costo_h = h_update(costo_h_s, ficha, hueco_v, hueco, v)
+                else:
+                    costo_h = h(v)
+                frontera.push(nuevo_g + costo_h, nuevo_g, (v, hueco_v, hueco))
+
+    return None, float("inf"), expandidos
+
+
+def _volcar_heap(stats: Optional[EstadisticasBusqueda], frontera: HeapIndexado) -> None:
+    if stats is not None:
+        stats.pushes += frontera.pushes
+        stats.decrementos += frontera.decrementos
+
+
+def _greedy_indexado(grafo, inicio, objetivo, h, stats=None, control=None) -> Tuple[Optional[Path], float, int]:
+    """Greedy con HeapIndexado: cada estado entra una sola vez a la frontera.
+    Clave (h, estado): mismo orden que el heap de greedy_codicioso."""
+    from agente___.algorithms.utils import get_costo
+    h_update = getattr(h, "update", None)
+    movimiento = getattr(grafo, "movimiento", _movimiento)
+    frontera = HeapIndexado()
+    frontera.actualizar((h(inicio), inicio), inicio)
+    visitado: Set[Estado] = set()
+    padre: Dict[Estado, Estado] = {}
+    expandidos = 0
+    try:
+        while frontera:
+            (costo_h, _), s = frontera.pop()
+            visitado.add(s)
+            expandidos += 1
+            if stats is not None:
+                stats.al_expandir(s, 0.0, costo_h, len(frontera) + 1)
+            if s == objetivo:
+                camino = _reconstruir_camino(padre, s)
+                costo_total, _ = get_costo(camino, grafo, raise_on_missing=True)
+                return camino, costo_total, expandidos
+            if control is not None:
+                _verificar(control, s, costo_h, costo_h, expandidos, padre)
+            for v, w in grafo.get(s, {}).items():
+                if v in visitado or v in frontera:   # h(v) no cambia: no hay nada que actualizar
+                    continue
+                padre[v] = s
+                if h_update is not None:
+                    costo_h_v = h_update(costo_h, *movimiento(s, v), v)
+                else:
+                    costo_h_v = h(v)
+                frontera.actualizar((costo_h_v, v), v)
+        return None, float("inf"), expandidos
+    finally:
+        _volcar_heap(stats, frontera)
+
+
+def _a_estrella_indexado(grafo, inicio, objetivo, h, stats=None, control=None) -> Tuple[Optional[Path], float, int]:
+    """
+    A* con HeapIndexado: una entrada por nodo abierto; si su g mejora se baja su
+    clave (decrease-key) en vez de encolar un duplicado, así no hay pops obsoletos.
+    Clave (f, estado): mismo orden que el heap de a_estrella, así las
+    expansiones coinciden y solo cambia el tamaño de la frontera.
+    """
+    h_update = getattr(h, "update", None)
+    movimiento = getattr(grafo, "movimiento", _movimiento)
+    frontera = HeapIndexado()
+    costo_g: Dict[Estado, float] = {inicio: 0.0}
+    padre: Dict[Estado, Estado] = {}
+    cerrado: Set[Estado] = set()
+    expandidos = 0
+
+    frontera.actualizar((h(inicio), inicio), inicio)
+    try:
+        while frontera:
+            (costo_f, _), s = frontera.pop()
+            cerrado.add(s)
+            expandidos += 1
+            g_s = costo_g[s]
+            if stats is not None:
+                stats.al_expandir(s, g_s, costo_f, len(frontera) + 1)
+            if s == objetivo:
+                return _reconstruir_camino(padre, s), g_s, expandidos
+
+            costo_h_s = costo_f - g_s
+            if control is not None:
+                _verificar(control, s, costo_h_s, costo_f, expandidos, padre)
+            for v, w in grafo.get(s, {}).items():
+                if v in cerrado:
+                    continue
+                nuevo_g = g_s + float(w)
+                g_v = costo_g.get(v)
+                if g_v is None:
+                    if h_update is not None:
+                        costo_h = h_update(costo_h_s, *movimiento(s, v), v)
+                    else:
+                        costo_h = h(v)
+                    frontera.actualizar((nuevo_g + costo_h, v), v)
+                elif nuevo_g < g_v:
+                    # v sigue abierto (sin reapertura): misma h, f baja lo mismo que g
+                    if stats is not None:
+                        stats.reabiertos += 1
+                    frontera.actualizar((frontera.clave(v)[0] - (g_v - nuevo_g), v), v)
+                else:
+                    continue
+                costo_g[v] = nuevo_g
+                padre[v] = s
+        return None, float("inf"), expandidos
+    finally:
+        _volcar_heap(stats, frontera)
+
+
+def _a_estrella_lotes(grafo, inicio, objetivo, h_lote, tam_lote, stats=None, control=None) -> Tuple[Optional[Path], float, int]:
+    """
+    A* por lotes: amortiza el costo por llamada de h evaluando muchos sucesores a la vez.
+    - El lote se corta al desencolar la meta: solo se acepta si sale primera, es
+      decir, con todos los sucesores previos ya en la frontera.
+    - Un nodo del lote puede mejorar su g por otro del mismo lote, así que se
+      permite reabrir cerrados (A* con reapertura sigue siendo óptimo con h admisible).
+    """
+    from agente___.algorithms.heuristics_np import a_matriz
+
+    frontera: List[Tuple[float, Estado]] = []
+    costo_g: Dict[Estado, float] = {inicio: 0.0}
+    padre: Dict[Estado, Estado] = {}
+    cerrado: Set[Estado] = set()
+    expandidos = 0
+
+    heappush(frontera, (float(h_lote(a_matriz([inicio]))[0]), inicio))
+
+    while frontera:
+        lote: List[Tuple[float, Estado]] = []    # (f con que salió, estado)
+        while frontera and len(lote) < tam_lote:
+            costo_f, s = heappop(frontera)
+            if s in cerrado:
+                if stats is not None:
+                    stats.pops_obsoletos += 1
+                continue
+            if s == objetivo:
+                if not lote:
+                    return _reconstruir_camino(padre, s), costo_g[s], expandidos + 1
+                heappush(frontera, (costo_f, s))  # se reevalúa tras expandir el lote
+                break
+            cerrado.add(s)
+            lote.append((costo_f, s))
+            if stats is not None:
+                stats.al_expandir(s, costo_g[s], costo_f, len(frontera) + 1)
+        for costo_f, s in lote:
+            expandidos += 1
+            if control is not None:
+                _verificar(control, s, costo_f - costo_g[s], costo_f, expandidos, padre)
+
+        hijos: List[Estado] = []
+        for _, s in lote:
+            for v, w in grafo.get(s, {}).items():
+                nuevo_g = costo_g[s] + float(w)
+                if v not in costo_g or nuevo_g < costo_g[v]:
+                    if stats is not None:
+                        stats.pushes += 1
+                        if v in costo_g:
+                            stats.reabiertos += 1
+                    costo_g[v] = nuevo_g
+                    padre[v] = s
+                    cerrado.discard(v)
+                    hijos.append(v)
+        if hijos:
+            for v, costo_h in zip(hijos, h_lote(a_matriz(hijos)).tolist()):
+                heappush(frontera, (costo_g[v] + costo_h, v))
+
+    return None, float("inf"), expandidos
+
+
 def greedy_codicioso(
     grafo: GrafoPonderado,
     inicio: Estado,
     objetivo: Estado,
     h: Callable[[Estado], float],  # costo_h estimado a meta
+    stats: Optional[EstadisticasBusqueda] = None,
+    indexado: bool = False,  # True: frontera HeapIndexado (una entrada por estado)
+    max_expansiones: Optional[int] = None,
+    deadline_ms: Optional[float] = None,
+    cancelar: Optional[TokenCancelacion] = None,
 ) -> Tuple[Optional[Path], float, int]:
     """
     Estrategia: Expandir primero el estado que se piensa más cerca de la meta (h(n) mínimo).
     No garantiza optimalidad en costo. (profundidad mal guiada si h es mala)
+    Con límites (max_expansiones/deadline_ms/cancelar) puede lanzar BusquedaAbortada.
     """
     from agente___.algorithms.utils import get_costo  # para calcular costo real del camino
 
     grafo = GraphAdapter(grafo)  # adaptar para get_costo
+    if stats is not None:
+        grafo = stats.medir_grafo(grafo)
+        h = stats.medir_h(h)
+    control = crear_control(max_expansiones, deadline_ms, cancelar)
+    if indexado:
+        return _greedy_indexado(grafo, inicio, objetivo, h, stats, control)
+    if _es_sliding(grafo):
+        return _greedy_sliding(grafo, inicio, objetivo, h, stats, control)
+    h_update = getattr(h, "update", None)  # forma incremental de h (sliding tile)
+    movimiento = getattr(grafo, "movimiento", _movimiento)
 
     # frontera prioriza por h(n) = costo_h
     frontera: List[Tuple[float, Estado]] = []
@@ -63,14 +512,20 @@ def greedy_codicioso(
     while frontera:
         costo_h, s = heappop(frontera)     # desencolar el más prometedor por h
         if s in visitado:
+            if stats is not None:
+                stats.pops_obsoletos += 1
             continue
         visitado.add(s)
         expandidos += 1
+        if stats is not None:
+            stats.al_expandir(s, 0.0, costo_h, len(frontera) + 1)
 
         if s == objetivo:
             camino = _reconstruir_camino(padre, s)
             costo_total, _ = get_costo(camino, grafo, raise_on_missing=True)
             return camino, costo_total, expandidos
+        if control is not None:
+            _verificar(control, s, costo_h, costo_h, expandidos, padre)
 
         # expandir sucesores
         for v, w in grafo.get(s, {}).items():
@@ -78,7 +533,13 @@ def greedy_codicioso(
                 continue
             if v not in padre:             # no sobrescribir padre si ya tiene
                 padre[v] = s
-            heappush(frontera, (h(v), v))  # ordenar solo por h(n)
+            if h_update is not None:
+                costo_h_v = h_update(costo_h, *movimiento(s, v), v)
+            else:
+                costo_h_v = h(v)
+            if stats is not None:
+                stats.pushes += 1
+            heappush(frontera, (costo_h_v, v))  # ordenar solo por h(n)
 
     return None, float("inf"), expandidos
 
@@ -88,32 +549,84 @@ def a_estrella(
     inicio: Estado,
     objetivo: Estado,
     h: Callable[[Estado], float],  # costo_h estimado a meta (ideal: admisible/consistente)
+    h_lote: Optional[Callable] = None,  # h vectorizada (heuristics_np) -> modo por lotes
+    tam_lote: int = 32,
+    stats: Optional[EstadisticasBusqueda] = None,
+    desempate: Optional[str] = None,  # "max_g" | "lifo" | "fifo" -> FronteraCubetas (sliding tile)
+    indexado: bool = False,  # True: frontera HeapIndexado con decrease-key
+    max_expansiones: Optional[int] = None,
+    deadline_ms: Optional[float] = None,
+    cancelar: Optional[TokenCancelacion] = None,
 ) -> Tuple[Optional[Path], float, int]:
     """
     A*: combina Costo Uniforme (g) y Codicioso (h):
          f(n) = g(n) + h(n)
     - Óptimo si h es admisible (no sobreestima) y consistente.
     - ¡Finaliza al DESENCOLAR el objetivo de la frontera!
+    - Con h_lote: desencola hasta tam_lote nodos, genera todos sus sucesores y
+      los evalúa en una sola llamada (sliding tile, estados como tupla).
+    - Con stats: cuenta generados/reabiertos/pops obsoletos, pico de frontera y
+      tiempo en h y en sucesores.
+    - Con límites (max_expansiones/deadline_ms/cancelar) puede lanzar
+      BusquedaAbortada; su cota_f es el mayor f desencolado.
+    - Con desempate: frontera por cubetas de f entero (FronteraCubetas) en vez
+      del heap, con esa política entre empates. Solo sliding tile (costo 1, h entera).
+    - Con indexado: HeapIndexado con decrease-key, una entrada por nodo abierto
+      (stats.pico_frontera muestra el ahorro frente a las entradas duplicadas del heap).
     """
+    if stats is not None:
+        grafo = stats.medir_grafo(grafo)
+        h = stats.medir_h(h)
+        if h_lote is not None:
+            h_lote = stats.medir_h(h_lote)
+    control = crear_control(max_expansiones, deadline_ms, cancelar)
+    if h_lote is not None:
+        if desempate is not None or indexado:
+            raise ValueError("El modo por lotes usa su propio heap: no admite desempate ni indexado")
+        if isinstance(inicio, int):
+            raise ValueError("El modo por lotes necesita estados como tupla (no empaquetados)")
+        return _a_estrella_lotes(grafo, inicio, objetivo, h_lote, tam_lote, stats, control)
+    if desempate is not None and indexado:
+        raise ValueError("desempate (cubetas) e indexado son fronteras distintas: elegir una")
+    if indexado:
+        return _a_estrella_indexado(grafo, inicio, objetivo, h, stats, control)
+    if desempate is not None:
+        if not _es_sliding(grafo):
+            raise ValueError("La frontera por cubetas necesita costos unitarios (grafo sliding tile)")
+        return _a_estrella_cubetas(grafo, inicio, objetivo, h, desempate, stats, control)
+    if _es_sliding(grafo):
+        return _a_estrella_sliding(grafo, inicio, objetivo, h, stats, control)
+
     # frontera con tuplas (costo_f, estado), donde costo_f = costo_g + costo_h
     frontera: List[Tuple[float, Estado]] = []
     costo_g: Dict[Estado, float] = {inicio: 0.0}         # g(n): costo acumulado desde inicio
     padre: Dict[Estado, Estado] = {}
     cerrado: Set[Estado] = set()                         # ya optimizados/definitivos
     expandidos = 0
+    h_update = getattr(h, "update", None)  # forma incremental de h (sliding tile)
+    movimiento = getattr(grafo, "movimiento", _movimiento)
 
     heappush(frontera, (h(inicio), inicio))  # f(inicio)=0+h(inicio)
 
     while frontera:
         costo_f, s = heappop(frontera)       # SI: terminar al DESENCOLAR meta
         if s in cerrado:
+            if stats is not None:
+                stats.pops_obsoletos += 1
             continue
         cerrado.add(s)
         expandidos += 1
+        if stats is not None:
+            stats.al_expandir(s, costo_g[s], costo_f, len(frontera) + 1)
 
         if s == objetivo:
             return _reconstruir_camino(padre, s), costo_g[s], expandidos
 
+        # la primera entrada desencolada de s es la de menor g, así que h(s) = f - g
+        costo_h_s = costo_f - costo_g[s]
+        if control is not None:
+            _verificar(control, s, costo_h_s, costo_f, expandidos, padre)
+
         # expandir sucesores
         for v, w in grafo.get(s, {}).items():
             if v in cerrado:
@@ -121,10 +634,560 @@ def a_estrella(
             nuevo_g = costo_g[s] + float(w)  # candidato g(nuevo)
             # relajación estándar
             if v not in costo_g or nuevo_g < costo_g[v]:
+                if stats is not None:
+                    stats.pushes += 1
+                    if v in costo_g:
+                        stats.reabiertos += 1
                 costo_g[v] = nuevo_g
                 padre[v] = s
-                costo_h = h(v)
+                if h_update is not None:
+                    costo_h = h_update(costo_h_s, *movimiento(s, v), v)
+                else:
+                    costo_h = h(v)
                 costo_f = nuevo_g + costo_h  # f(n) = g(n) + h(n)
                 heappush(frontera, (costo_f, v))
 
     return None, float("inf"), expandidos
+
+
+def ida_estrella(
+    grafo: GrafoPonderado,
+    inicio: Estado,
+    objetivo: Estado,
+    h: Callable[[Estado], float],  # costo_h estimado a meta (ideal: admisible/consistente)
+    max_expansiones: Optional[int] = None,
+    deadline_ms: Optional[float] = None,
+    cancelar: Optional[TokenCancelacion] = None,
+    stats: Optional[EstadisticasBusqueda] = None,
+) -> Tuple[Optional[Path], float, int]:
+    """
+    IDA* (A* por profundización iterativa):
+    - DFS acotado por f(n) = g(n) + h(n) <= cota; si falla, la nueva cota es
+      el menor f que superó la anterior.
+    - Memoria O(profundidad): solo guarda el camino actual (sin costo_g/padre/cerrado).
+    - Nunca regenera un estado que ya está en el camino (incluido el padre).
+    - Óptimo si h es admisible.
+    - Con límites puede lanzar BusquedaAbortada; su cota_f es la cota en curso
+      (cota inferior del óptimo: las anteriores ya fallaron).
+    """
+    control = crear_control(max_expansiones, deadline_ms, cancelar)
+    if stats is not None:
+        grafo = stats.medir_grafo(grafo)
+        h = stats.medir_h(h)
+    camino: Path = [inicio]
+    mejor_camino: Path = [inicio]
+    en_camino: Set[Estado] = {inicio}
+    expandidos = 0
+    costo_meta = float("inf")
+    ENCONTRADO = -1.0
+    h_update = getattr(h, "update", None)  # forma incremental de h (sliding tile)
+    movimiento = getattr(grafo, "movimiento", _movimiento)
+    sliding = _es_sliding(grafo)
+
+    def sucesores(s: Estado, hueco: int, hueco_padre: int, costo_h: float):
+        """Genera (v, costo_arista, hueco_v, h(v)); hueco solo se usa en sliding tile."""
+        if sliding:
+            for v, hueco_v, ficha in grafo.expandir(s, hueco, hueco_padre):
+                if h_update is not None:
+                    yield v, 1.0, hueco_v, h_update(costo_h, ficha, hueco_v, hueco, v)
+                else:
+                    yield v, 1.0, hueco_v, h(v)
+            return
+        for v, w in grafo.get(s, {}).items():
+            if v in en_camino:
+                continue
+            if h_update is not None:
+                yield v, float(w), -1, h_update(costo_h, *movimiento(s, v), v)
+            else:
+                yield v, float(w), -1, h(v)
+
+    def buscar(s: Estado, hueco: int, hueco_padre: int,
+               costo_g: float, costo_h: float, cota: float) -> float:
+        nonlocal expandidos, costo_meta
+        costo_f = costo_g + costo_h
+        if costo_f > cota:
+            return costo_f                    # candidato para la siguiente cota
+        if s == objetivo:
+            costo_meta = costo_g
+            return ENCONTRADO
+        expandidos += 1
+        if stats is not None:
+            stats.al_expandir(s, costo_g, cota, len(camino))  # frontera = camino actual
+        if control is not None:
+            if costo_h < control.mejor_h:
+                mejor_camino[:] = camino      # no hay padre: se copia el camino al mejorar
+            motivo = control.verificar(s, costo_h, cota, expandidos)
+            if motivo is not None:
+                raise control.abortar(motivo, expandidos, list(mejor_camino))
+        minimo = float("inf")
+        for v, w, hueco_v, costo_h_v in sucesores(s, hueco, hueco_padre, costo_h):
+            if v in en_camino:                # evita volver al padre / ciclos
+                continue
+            camino.append(v)
+            en_camino.add(v)
+            t = buscar(v, hueco_v, hueco, costo_g + w, costo_h_v, cota)
+            if t == ENCONTRADO:
+                return ENCONTRADO
+            if t < minimo:
+                minimo = t
+            camino.pop()
+            en_camino.discard(v)
+        return minimo
+
+    costo_h = h(inicio)
+    hueco = grafo.hueco(inicio) if sliding else -1
+    cota = costo_h
+    while True:
+        t = buscar(inicio, hueco, -1, 0.0, costo_h, cota)
+        if t == ENCONTRADO:
+            return list(camino), costo_meta, expandidos
+        if t == float("inf"):
+            return None, float("inf"), expandidos
+        cota = t
+
+
+def _tope_valido(heap: list, abierto: Set[Estado], costo_g: Dict[Estado, float]) -> float:
+    """Clave mínima del heap descartando entradas obsoletas (cerradas o con g viejo)."""
+    while heap:
+        clave, s, g_s = heap[0]
+        if s in abierto and costo_g[s] == g_s:
+            return clave
+        heappop(heap)
+    return float("inf")
+
+
+def a_estrella_bidireccional(
+    grafo: GrafoPonderado,
+    inicio: Estado,
+    objetivo: Estado,
+    h: Callable[[Estado], float],          # estimación hacia objetivo (p.ej. factory(objetivo))
+    h_inversa: Callable[[Estado], float],  # estimación hacia inicio   (p.ej. factory(inicio))
+    epsilon: Optional[float] = None,       # costo mínimo de arista (1 en sliding tile)
+    max_expansiones: Optional[int] = None,
+    deadline_ms: Optional[float] = None,
+    cancelar: Optional[TokenCancelacion] = None,
+) -> Tuple[Optional[Path], float, int]:
+    """
+    Búsqueda bidireccional MM ("Meet in the Middle", Holte et al. 2016):
+    - Dos fronteras: desde inicio con h y desde objetivo con h_inversa.
+      Requiere aristas reversibles (sliding tile, grafos no dirigidos como Rumania).
+    - Prioridad pr(n) = max(f(n), 2*g(n)): ninguna dirección pasa de la mitad
+      del camino óptimo, así que las búsquedas se encuentran en el medio.
+    - Se expande la dirección con menor pr; U = mejor camino conectado hasta ahora.
+    - Para cuando U <= max(C, fminF, fminB, gminF + gminB + epsilon), con
+      C = min(prminF, prminB). Óptimo si h y h_inversa son admisibles.
+    - Con límites puede lanzar BusquedaAbortada; su cota_f es esa misma cota
+      inferior y el camino parcial sale de la búsqueda hacia adelante.
+    """
+    if epsilon is None:
+        epsilon = 1.0 if _es_sliding(grafo) else 0.0
+    if inicio == objetivo:
+        return [inicio], 0.0, 0
+    control = crear_control(max_expansiones, deadline_ms, cancelar)
+
+    hs = (h, h_inversa)
+    costo_g: Tuple[Dict[Estado, float], Dict[Estado, float]] = ({inicio: 0.0}, {objetivo: 0.0})
+    padre: Tuple[Dict[Estado, Estado], Dict[Estado, Estado]] = ({}, {})
+    abierto: Tuple[Set[Estado], Set[Estado]] = ({inicio}, {objetivo})
+    # heaps con entradas (clave, estado, g al encolar); se limpian de forma perezosa
+    colas_pr: Tuple[list, list] = ([], [])
+    colas_f: Tuple[list, list] = ([], [])
+    colas_g: Tuple[list, list] = ([], [])
+
+    def encolar(d: int, s: Estado, g_s: float) -> None:
+        costo_f = g_s + hs[d](s)
+        heappush(colas_pr[d], (max(costo_f, 2.0 * g_s), s, g_s))
+        heappush(colas_f[d], (costo_f, s, g_s))
+        heappush(colas_g[d], (g_s, s, g_s))
+
+    encolar(0, inicio, 0.0)
+    encolar(1, objetivo, 0.0)
+    mejor_U = float("inf")
+    encuentro: Optional[Estado] = None
+    expandidos = 0
+
+    while abierto[0] and abierto[1]:
+        prmin = [_tope_valido(colas_pr[d], abierto[d], costo_g[d]) for d in (0, 1)]
+        fmin = [_tope_valido(colas_f[d], abierto[d], costo_g[d]) for d in (0, 1)]
+        gmin = [_tope_valido(colas_g[d], abierto[d], costo_g[d]) for d in (0, 1)]
+        C = min(prmin)
+        cota_inf = max(C, fmin[0], fmin[1], gmin[0] + gmin[1] + epsilon)
+        if mejor_U <= cota_inf:
+            break
+
+        d = 0 if prmin[0] <= prmin[1] else 1
+        _, s, _ = heappop(colas_pr[d])  # válido: _tope_valido dejó arriba una entrada vigente
+        abierto[d].discard(s)
+        expandidos += 1
+        if control is not None:
+            # solo los nodos hacia adelante tienen camino parcial desde el inicio
+            if d == 0:
+                _verificar(control, s, h(s), cota_inf, expandidos, padre[0])
+            else:
+                motivo = control.verificar(s, float("inf"), cota_inf, expandidos)
+                if motivo is not None:
+                    mejor = control.mejor_estado
+                    raise control.abortar(motivo, expandidos,
+                                          _reconstruir_camino(padre[0], mejor) if mejor is not None else None)
+
+        g_s = costo_g[d][s]
+        for v, w in grafo.get(s, {}).items():
+            nuevo_g = g_s + float(w)
+            if v in costo_g[d] and costo_g[d][v] <= nuevo_g:
+                continue
+            costo_g[d][v] = nuevo_g          # nuevo o reabierto con mejor g
+            padre[d][v] = s
+            abierto[d].add(v)
+            encolar(d, v, nuevo_g)
+            otro = costo_g[1 - d]
+            if v in otro and nuevo_g + otro[v] < mejor_U:
+                mejor_U = nuevo_g + otro[v]
+                encuentro = v
+
+    if encuentro is None:
+        return None, float("inf"), expandidos
+
+    camino = _reconstruir_camino(padre[0], encuentro)
+    cur = encuentro
+    while cur in padre[1]:
+        cur = padre[1][cur]
+        camino.append(cur)
+    return camino, mejor_U, expandidos
+
+
+# Estimación de bytes por nodo en memoria (objeto nodo, sucesores, olvidados y
+# entradas en los heaps), además del propio estado. Es una cota aproximada para
+# convertir max_bytes en número de nodos, no una medición exacta.
+_BYTES_POR_NODO = 400
+
+
+class _NodoSMA:
+    """Nodo del árbol de SMA*: el mismo estado puede estar en varias ramas."""
+    __slots__ = ("estado", "g", "f", "prof", "padre", "sucesores", "hijos", "olvidado", "vivo")
+
+    def __init__(self, estado, g: float, f: float, prof: int, padre: Optional["_NodoSMA"]):
+        self.estado = estado
+        self.g = g
+        self.f = f                     # con pathmax y valores respaldados: solo sube
+        self.prof = prof
+        self.padre = padre
+        self.sucesores: Optional[List[Tuple[Estado, float]]] = None  # None = sin expandir
+        self.hijos: Dict[Estado, "_NodoSMA"] = {}                  # hijos en memoria
+        self.olvidado: Dict[Estado, float] = {}                    # f respaldado de hijos podados
+        self.vivo = True
+
+    def clave(self) -> Optional[float]:
+        """f del mejor sucesor que falta generar (None si están todos en memoria)."""
+        if self.sucesores is None:
+            return self.f
+        return min(self.olvidado.values()) if self.olvidado else None
+
+    def camino(self) -> Path:
+        camino: Path = []
+        nodo = self
+        while nodo is not None:
+            camino.append(nodo.estado)
+            nodo = nodo.padre
+        camino.reverse()
+        return camino
+
+
+def a_estrella_memoria_acotada(
+    grafo: GrafoPonderado,
+    inicio: Estado,
+    objetivo: Estado,
+    h: Callable[[Estado], float],
+    max_nodos: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    max_expansiones: Optional[int] = None,
+    deadline_ms: Optional[float] = None,
+    cancelar: Optional[TokenCancelacion] = None,
+) -> Tuple[Optional[Path], float, int, Dict[str, int]]:
+    """
+    SMA* (Simplified Memory-bounded A*, Russell 1992):
+    - Búsqueda en árbol (sin volver a estados del propio camino) que expande el
+      nodo de menor f (el más profundo en empates) y, si hay más de max_nodos
+      nodos en memoria, poda la hoja de PEOR f (la menos profunda en empates).
+    - El f de la hoja podada queda respaldado en su padre (olvidado[estado]) y el
+      padre vuelve a la frontera para regenerarla con ese f cuando sea la mejor
+      opción; f(hijo) = max(f(padre), g + h) y, cuando el padre tiene todos sus
+      sucesores evaluados, f(padre) = min f de los hijos (en memoria u olvidados).
+    - Un nodo a profundidad max_nodos - 1 que no es la meta recibe f = inf (su
+      camino ya ocupa toda la memoria): memoria["descartados"] los cuenta.
+    - max_bytes se convierte a nodos con una estimación por nodo.
+    - Óptimo (h admisible) si el camino óptimo tiene a lo sumo max_nodos estados;
+      si no, devuelve la mejor solución que cabe. Nunca hay más de max_nodos
+      nodos en memoria.
+    Retorna: (camino, costo_total, expandidos, memoria) con
+      memoria = {"max_nodos", "pico_nodos", "pico_bytes", "podados", "descartados"}.
+    Si la meta solo se alcanza por caminos que no caben, lanza BusquedaAbortada con
+    motivo MEMORIA (no es "sin solución") y cota_f = menor f entre los nodos
+    descartados; con límites también puede lanzarla.
+    En ambos casos la excepción lleva el mismo dict en e.memoria.
+    """
+    import sys
+    control = crear_control(max_expansiones, deadline_ms, cancelar)
+    bytes_por_nodo = sys.getsizeof(inicio) + _BYTES_POR_NODO
+    limite = float("inf")
+    if max_nodos is not None:
+        limite = max_nodos
+    if max_bytes is not None:
+        limite = min(limite, max(1, max_bytes // bytes_por_nodo))
+
+    raiz = _NodoSMA(inicio, 0.0, h(inicio), 0, None)
+    orden = 0                                          # desempate estable en los heaps
+    frontera: List[tuple] = [(raiz.f, 0, orden, raiz)]  # (clave, -prof, orden, nodo), perezoso
+    hojas: List[tuple] = []                             # (-f, prof, orden, nodo), perezoso
+    vivos = 1
+    expandidos = 0
+    podados = 0
+    descartados = 0
+    pico = 1
+    cota_f = float("-inf")
+    cota_descartados = float("inf")                     # min f de los nodos sin lugar
+    mejor = raiz
+
+    def _memoria() -> Dict[str, int]:
+        return {"max_nodos": int(limite) if limite != float("inf") else -1,
+                "pico_nodos": pico, "pico_bytes": pico * bytes_por_nodo, "podados": podados,
+                "descartados": descartados}
+
+    def encolar(nodo: _NodoSMA) -> None:
+        nonlocal orden
+        clave = nodo.clave()
+        if clave is not None:
+            orden += 1
+            heappush(frontera, (clave, -nodo.prof, orden, nodo))
+
+    def marcar_hoja(nodo: _NodoSMA) -> None:
+        nonlocal orden
+        if nodo is not raiz and not nodo.hijos:
+            orden += 1
+            heappush(hojas, (-nodo.f, nodo.prof, orden, nodo))
+
+    def respaldar(nodo: _NodoSMA) -> None:
+        """Sube el f de nodo (y ancestros) al mínimo de sus hijos evaluados."""
+        while nodo is not None and nodo.sucesores is not None:
+            nuevo = min(min((c.f for c in nodo.hijos.values()), default=float("inf")),
+                        min(nodo.olvidado.values(), default=float("inf")))
+            if nuevo <= nodo.f:
+                return
+            nodo.f = nuevo
+            marcar_hoja(nodo)
+            nodo = nodo.padre
+
+    def podar(protegido: _NodoSMA) -> None:
+        """Poda la peor hoja (que no sea protegido) y respalda su f en el padre."""
+        nonlocal vivos, podados
+        saltada = None
+        while hojas:
+            entrada = heappop(hojas)
+            c = entrada[3]
+            if not c.vivo or c.hijos or -entrada[0] != c.f:
+                continue                                  # entrada obsoleta
+            if c is protegido:
+                saltada = entrada
+                continue
+            p = c.padre
+            c.vivo = False
+            del p.hijos[c.estado]
+            p.olvidado[c.estado] = c.f
+            vivos -= 1
+            podados += 1
+            encolar(p)
+            marcar_hoja(p)
+            break
+        if saltada is not None:
+            heappush(hojas, saltada)
+
+    def abortar(motivo: str, cota: float) -> BusquedaAbortada:
+        e = BusquedaAbortada(motivo, expandidos, cota, mejor.estado, mejor.f - mejor.g, mejor.camino())
+        e.memoria = _memoria()
+        return e
+
+    while frontera:
+        clave, _, _, n = heappop(frontera)
+        if not n.vivo or clave != n.clave():
+            continue                                      # entrada obsoleta
+        if clave == float("inf"):
+            break                                         # lo que queda no cabe en memoria
+        if n.estado == objetivo:
+            return n.camino(), n.g, expandidos, _memoria()
+        expandidos += 1
+        cota_f = max(cota_f, clave)
+
+        if n.f - n.g < mejor.f - mejor.g:
+            mejor = n
+        if control is not None:
+            motivo = control.verificar(n.estado, n.f - n.g, clave, expandidos)
+            if motivo is not None:
+                raise abortar(motivo, cota_f)
+
+        if n.sucesores is None:
+            en_camino = set()
+            a = n.padre
+            while a is not None:
+                en_camino.add(a.estado)
+                a = a.padre
+            n.sucesores = [(v, float(w)) for v, w in grafo.get(n.estado, {}).items()
+                           if v not in en_camino]
+            pendientes = n.sucesores
+        else:
+            pendientes = [(v, w) for v, w in n.sucesores if v in n.olvidado]
+
+        for v, w in pendientes:
+            f_olvidado = n.olvidado.pop(v, float("-inf"))
+            prof = n.prof + 1
+            g_v = n.g + w
+            if v != objetivo and prof >= limite - 1:
+                n.olvidado[v] = float("inf")              # no queda lugar para sus hijos
+                descartados += 1
+                cota_descartados = min(cota_descartados, max(n.f, g_v + h(v)))
+                continue
+            while vivos >= limite:
+                antes = vivos
+                podar(n)
+                if vivos == antes:
+                    break
+            hijo = _NodoSMA(v, g_v, max(n.f, g_v + h(v), f_olvidado), prof, n)
+            n.hijos[v] = hijo
+            vivos += 1
+            encolar(hijo)
+            marcar_hoja(hijo)
+        pico = max(pico, vivos)
+        encolar(n)                                        # si se podó algún hijo recién generado
+        respaldar(n)
+
+    if descartados:
+        # todo camino a la meta pasa por un nodo descartado: su f acota el óptimo
+        raise abortar(MEMORIA, cota_descartados)
+    return None, float("inf"), expandidos, _memoria()
+
+
+def ara_estrella(
+    grafo: GrafoPonderado,
+    inicio: Estado,
+    objetivo: Estado,
+    h: Callable[[Estado], float],
+    deadline_ms: Optional[float] = None,   # presupuesto de tiempo total (None = sin límite)
+    w_inicial: float = 3.0,
+    paso_w: float = 0.5,
+    al_mejorar: Optional[Callable[[Path, float, float], None]] = None,  # (camino, costo, cota)
+    max_expansiones: Optional[int] = None,
+    cancelar: Optional[TokenCancelacion] = None,
+    stats: Optional[EstadisticasBusqueda] = None,
+) -> Tuple[Optional[Path], float, int, float]:
+    """
+    ARA* (Anytime Repairing A*, Likhachev et al. 2003):
+    - Primero A* ponderado con f'(n) = g(n) + w*h(n), w > 1: encuentra rápido
+      una solución con costo <= w * óptimo.
+    - Luego baja w y REPARA la búsqueda reutilizando lo ya calculado: solo se
+      reexpanden los nodos cuyo g mejoró (lista de inconsistentes).
+    - Cada solución cumple costo <= cota * óptimo, con
+      cota = min(w, g(meta) / min(g+h) en abiertos ∪ inconsistentes).
+    - Para al llegar a cota = 1 (óptimo con h admisible y consistente) o al
+      agotar deadline_ms / max_expansiones o al cancelar; devuelve la mejor
+      solución hallada hasta ahí (no lanza BusquedaAbortada).
+    Retorna: (camino, costo_total, expandidos, cota)
+    """
+    from agente___.algorithms.utils import get_costo
+
+    grafo_costos = GraphAdapter(grafo)      # sin medir: solo para sumar el camino
+    control = crear_control(max_expansiones, deadline_ms, cancelar)
+    if stats is not None:
+        grafo = stats.medir_grafo(grafo)
+        h = stats.medir_h(h)
+
+    costo_g: Dict[Estado, float] = {inicio: 0.0}
+    padre: Dict[Estado, Estado] = {}
+    valor_h: Dict[Estado, float] = {inicio: h(inicio)}
+    abierto: Set[Estado] = {inicio}
+    cerrado: Set[Estado] = set()
+    incons: Set[Estado] = set()
+    frontera: List[Tuple[float, Estado, float]] = []
+    expandidos = 0
+    w = max(1.0, w_inicial)
+
+    def clave(s: Estado) -> float:
+        return costo_g[s] + w * valor_h[s]
+
+    def reconstruir_frontera() -> None:
+        frontera.clear()
+        for s in abierto:
+            frontera.append((clave(s), s, costo_g[s]))
+        heapify(frontera)
+
+    def mejorar_camino() -> bool:
+        """Expande mientras la meta no sea la mejor clave. False si hubo que cortar."""
+        nonlocal expandidos
+        while frontera:
+            k, s, g_s = frontera[0]
+            if s not in abierto or g_s != costo_g[s]:
+                heappop(frontera)                   # entrada obsoleta
+                if stats is not None:
+                    stats.pops_obsoletos += 1
+                continue
+            if objetivo in costo_g and clave(objetivo) <= k:
+                return True
+            if control is not None and control.motivo(expandidos) is not None:
+                return False
+            heappop(frontera)
+            abierto.discard(s)
+            cerrado.add(s)
+            expandidos += 1
+            if stats is not None:
+                # f = g + h sin peso: la clave g + w*h no es una f ni una cota
+                stats.al_expandir(s, g_s, g_s + valor_h[s], len(frontera) + 1)
+            for v, c in grafo.get(s, {}).items():
+                nuevo_g = costo_g[s] + float(c)
+                if v in costo_g and costo_g[v] <= nuevo_g:
+                    continue
+                costo_g[v] = nuevo_g
+                padre[v] = s
+                if v not in valor_h:
+                    valor_h[v] = h(v)
+                if v in cerrado:
+                    incons.add(v)                   # se reabrirá con el próximo w
+                else:
+                    abierto.add(v)
+                    heappush(frontera, (clave(v), v, nuevo_g))
+        return True
+
+    def cota_actual(costo: float, completo: bool) -> float:
+        # min(g+h) en abiertos ∪ inconsistentes es cota inferior del óptimo en
+        # todo momento; w solo vale como cota si mejorar_camino() terminó.
+        pendientes = [costo_g[s] + valor_h[s] for s in abierto | incons]
+        if not pendientes:
+            return 1.0
+        piso = min(pendientes)
+        razon = costo / piso if piso > 0 else float("inf")
+        return max(1.0, min(w, razon) if completo else razon)
+
+    mejor: Optional[Path] = None
+    mejor_costo = float("inf")
+    cota = float("inf")
+
+    reconstruir_frontera()
+    while True:
+        a_tiempo = mejorar_camino()
+        if objetivo in costo_g:
+            # padre ya puede tener mejoras posteriores al g de la meta: el camino
+            # reconstruido cuesta <= costo_g[objetivo]; vale lo que cuesta él
+            camino = _reconstruir_camino(padre, objetivo)
+            costo, _ = get_costo(camino, grafo_costos)
+            cota_w = cota_actual(costo, a_tiempo) if costo <= mejor_costo else cota
+            if costo < mejor_costo or cota_w < cota:
+                mejor, mejor_costo = camino, costo
+                cota = min(cota, cota_w)
+                if al_mejorar is not None:
+                    al_mejorar(mejor, mejor_costo, cota)
+        if not a_tiempo or cota <= 1.0 or (objetivo not in costo_g and not abierto):
+            break
+        # bajar w y reparar: inconsistentes vuelven a abiertos, cerrados se vacían
+        w = max(1.0, w - paso_w)
+        abierto |= incons
+        incons.clear()
+        cerrado.clear()
+        reconstruir_frontera()
+
+    return mejor, mejor_costo, expandidos, cota
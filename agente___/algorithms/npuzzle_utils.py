@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
-from typing import Tuple, List
+from typing import Iterator, Tuple, List
 import random
 
 EstadoST = Tuple[int, ...]
@@ -21,14 +21,96 @@ def _index(r: int, c: int, n: int) -> int:
 def _goal_canonical(n: int) -> EstadoST:
     return tuple(list(range(1, n*n)) + [0])
 
+# --- Estado empaquetado ------------------------------------------------------
+# Un estado se puede guardar como un solo int: la casilla i ocupa los bits
+# [i*b, (i+1)*b). Hasta 4x4 b = 4 (cabe en 64 bits); para tableros mayores
+# b = bits necesarios para n*n-1 y el int crece lo que haga falta.
+# Hash e igualdad de un int son mucho más baratos que los de una tupla.
+EstadoEmpaquetado = int
+
+def bits_por_ficha(n: int) -> int:
+    return max(4, (n * n - 1).bit_length())
+
+def empaquetar_estado(estado: EstadoST) -> EstadoEmpaquetado:
+    n = _n_from_state(estado)
+    b = bits_por_ficha(n)
+    codigo = 0
+    for i, v in enumerate(estado):
+        codigo |= v << (i * b)
+    return codigo
+
+def desempaquetar_estado(codigo: EstadoEmpaquetado, n: int) -> EstadoST:
+    b = bits_por_ficha(n)
+    mask = (1 << b) - 1
+    return tuple((codigo >> (i * b)) & mask for i in range(n * n))
+
+def como_tupla(estado, n: int | None = None) -> EstadoST:
+    """Devuelve el estado como tupla, sea cual sea su representación."""
+    if isinstance(estado, int):
+        if n is None:
+            raise ValueError("Se necesita n para desempaquetar el estado")
+        return desempaquetar_estado(estado, n)
+    return estado
+
+def ficha_empaquetada(codigo: EstadoEmpaquetado, idx: int, n: int) -> int:
+    b = bits_por_ficha(n)
+    return (codigo >> (idx * b)) & ((1 << b) - 1)
+
+def hueco_empaquetado(codigo: EstadoEmpaquetado, n: int) -> int:
+    b = bits_por_ficha(n)
+    mask = (1 << b) - 1
+    for i in range(n * n):
+        if (codigo >> (i * b)) & mask == 0:
+            return i
+    raise ValueError("Estado empaquetado sin hueco")
+
+def mover_empaquetado(codigo: EstadoEmpaquetado, idx0: int, idx: int, n: int) -> EstadoEmpaquetado:
+    """Mueve la ficha de idx al hueco idx0 (el nibble del hueco vale 0)."""
+    b = bits_por_ficha(n)
+    v = (codigo >> (idx * b)) & ((1 << b) - 1)
+    return codigo + (v << (idx0 * b)) - (v << (idx * b))
+
+# --- Rango de permutaciones (código de Lehmer) --------------------------------
+# Biyección entre las N! permutaciones de 0..N-1 y [0, N!) en orden
+# lexicográfico: el dígito i es cuántos valores menores que estado[i] quedan a
+# su derecha, en base mixta N, N-1, ..., 1. En 3x3 hay 9! = 362880 rangos (la
+# mitad alcanzables), así que cabe una tabla indexada por rango.
+
+def rango_permutacion(estado: EstadoST) -> int:
+    N = len(estado)
+    r = 0
+    for i in range(N):
+        v = estado[i]
+        menores = 0
+        for j in range(i + 1, N):
+            if estado[j] < v:
+                menores += 1
+        r = r * (N - i) + menores
+    return r
+
+def permutacion_desde_rango(r: int, N: int) -> EstadoST:
+    digitos = [0] * N
+    for i in range(N - 1, -1, -1):
+        r, digitos[i] = divmod(r, N - i)
+    libres = list(range(N))
+    return tuple(libres.pop(d) for d in digitos)
+
 def contar_inversiones(arr: List[int]) -> int:
-    inv = 0
+    # O(N log N) con un árbol de Fenwick sobre los valores ya vistos
     vals = [x for x in arr if x != 0]
-    for i in range(len(vals)):
-        ai = vals[i]
-        for j in range(i+1, len(vals)):
-            if ai > vals[j]:
-                inv += 1
+    tope = max(vals, default=0)
+    arbol = [0] * (tope + 1)
+    inv = 0
+    for vistos, v in enumerate(vals):
+        k, no_mayores = v, 0
+        while k > 0:
+            no_mayores += arbol[k]
+            k -= k & -k
+        inv += vistos - no_mayores        # vistos antes que v y mayores que v
+        k = v
+        while k <= tope:
+            arbol[k] += 1
+            k += k & -k
     return inv
 
 def fila_desde_abajo(idx_blank: int, n: int) -> int:
@@ -40,17 +122,20 @@ def es_soluble(estado: EstadoST, goal: EstadoST | None = None) -> bool:
     if goal is None:
         goal = _goal_canonical(n)
     inv_s = contar_inversiones(list(estado))
+    inv_g = contar_inversiones(list(goal))
     if n % 2 == 1:
-        return inv_s % 2 == 0
-    inv_g = 0
+        return inv_s % 2 == inv_g % 2
     rb_s = fila_desde_abajo(estado.index(0), n)
     rb_g = fila_desde_abajo(goal.index(0), n)
     return (inv_s + rb_s) % 2 == (inv_g + rb_g) % 2
 
-def generar_estado(n: int, pasos_barajado: int = 100, seed: int | None = None) -> EstadoST:
-    if seed is not None:
-        random.seed(seed)
-    goal = _goal_canonical(n)
+def generar_estado(n: int, pasos_barajado: int = 100, seed: int | None = None,
+                   rng: random.Random | None = None, goal: EstadoST | None = None) -> EstadoST:
+    # rng: generador propio; con seed se crea uno (el estado global de random no se toca)
+    # goal: desde dónde se baraja (por defecto el canónico)
+    azar = rng if rng is not None else (random.Random(seed) if seed is not None else random)
+    if goal is None:
+        goal = _goal_canonical(n)
     s = list(goal)
     idx0 = s.index(0)
     prev = None
@@ -63,9 +148,38 @@ def generar_estado(n: int, pasos_barajado: int = 100, seed: int | None = None) -
         if c < n-1:   moves.append(idx0 + 1)
         if prev in moves and len(moves) > 1:
             moves.remove(prev)
-        nxt = random.choice(moves)
+        nxt = azar.choice(moves)
         s[idx0], s[nxt] = s[nxt], s[idx0]
         prev, idx0 = idx0, nxt
     estado = tuple(s)
     assert es_soluble(estado, goal), "Generador produjo estado no soluble"
     return estado
+
+def estado_aleatorio(n: int, rng: random.Random, goal: EstadoST | None = None) -> EstadoST:
+    """Permutación uniforme entre las solubles: barajar y, si la paridad no da,
+    intercambiar las dos primeras fichas (biyección entre las dos mitades)."""
+    if goal is None:
+        goal = _goal_canonical(n)
+    s = list(goal)
+    rng.shuffle(s)
+    if not es_soluble(tuple(s), goal):
+        i, j = [k for k, v in enumerate(s) if v != 0][:2]
+        s[i], s[j] = s[j], s[i]
+    return tuple(s)
+
+def generador_instancias(n: int, seed=None, uniforme: bool = True, pasos_barajado: int = 100,
+                         goal: EstadoST | None = None) -> Iterator[EstadoST]:
+    """
+    Flujo infinito de estados solubles con un random.Random propio (misma seed,
+    misma secuencia). uniforme=True: permutaciones uniformes (estado_aleatorio);
+    False: caminatas aleatorias de pasos_barajado desde goal (canónico por defecto).
+        for s in itertools.islice(generador_instancias(4, seed=1), 10**6): ...
+    """
+    rng = random.Random(seed)
+    if goal is None:
+        goal = _goal_canonical(n)
+    while True:
+        if uniforme:
+            yield estado_aleatorio(n, rng, goal)
+        else:
+            yield generar_estado(n, pasos_barajado, rng=rng, goal=goal)
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+Pattern databases (PDB) aditivas y disjuntas para sliding tile n×n.
+
+- La partición divide las fichas en grupos disjuntos (p.ej. 6-6-3 en 4x4).
+- Para cada grupo se hace un BFS retrógrado desde el goal sobre el estado
+  abstracto (solo las posiciones de las fichas del grupo, sin el hueco): solo
+  se cuentan los movimientos de fichas del grupo. Así las distancias de los
+  grupos se pueden SUMAR y la suma es admisible y consistente.
+- Cada tabla es un bytearray indexado por el rango de la k-permutación de
+  posiciones (tamaño N!/(N-k)!, con N = n*n).
+- Las tablas se guardan en un archivo versionado y se abren con mmap.
+  Construirlas en Python puro: 3x3 4-4 menos de 1 s; en 4x4, ~7 s un grupo
+  de 5 fichas y ~1.3 min uno de 6 (6-6-3: ~2.5 min y ~45 MB la primera vez).
+
+Uso:
+    h = h_pdb_factory(goal)                 # partición por defecto según n
+    a_estrella(grafo, inicio, goal, h)
+"""
+from __future__ import annotations
+import hashlib, json, logging, mmap, os
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from agente___.algorithms.archivo_tablas import DIR_CACHE, guardar_tabla, leer_cabecera
+from agente___.algorithms.heuristics import EstadoST, _n_from_state
+from agente___.algorithms.npuzzle_utils import desempaquetar_estado
+from agente___.environments.sliding_graph import tabla_movimientos
+
+_log = logging.getLogger(__name__)
+
+Particion = List[List[int]]
+
+# Particiones por defecto (valores de ficha del goal canónico)
+PARTICIONES_DEFECTO: Dict[int, Particion] = {
+    3: [[1, 2, 3, 4], [5, 6, 7, 8]],
+    4: [[1, 5, 6, 9, 10, 13], [7, 8, 11, 12, 14, 15], [2, 3, 4]],                # 6-6-3
+}
+# Sin defecto para 5x5: un grupo de 6 fichas serían 25!/19! = 127M entradas.
+# Tope por grupo: el de 6 fichas en 4x4 (5.8M entradas, ~1.3 min en Python).
+TAM_MAXIMO_GRUPO = 16 * 15 * 14 * 13 * 12 * 11
+
+MAGIC = b"NPDB"
+VERSION = 2             # v1 incluía la región del hueco (no consistente)
+SIN_VISITAR = 255
+
+# --- Rango de k-permutaciones ---------------------------------------------------
+# pos = (p0, ..., pk-1) sin repetidos en [0, N). El dígito i es el índice de p_i
+# entre las casillas que aún no usaron p0..p_{i-1}; base mixta N, N-1, ...
+
+def tamano_tabla(N: int, k: int) -> int:
+    t = 1
+    for i in range(k):
+        t *= N - i
+    return t
+
+def rango_posiciones(pos: Sequence[int], N: int) -> int:
+    r = 0
+    for i, p in enumerate(pos):
+        menores = 0
+        for q in pos[:i]:
+            if q < p:
+                menores += 1
+        r = r * (N - i) + (p - menores)
+    return r
+
+def posiciones_desde_rango(r: int, k: int, N: int) -> List[int]:
+    digitos = [0] * k
+    for i in range(k - 1, -1, -1):
+        base = N - i
+        r, digitos[i] = divmod(r, base)
+    libres = list(range(N))
+    # el dígito d es la d-ésima casilla libre (0-based) sin contar las ya usadas
+    return [libres.pop(d) for d in digitos]
+
+# --- Construcción ------------------------------------------------------------------
+
+def construir_tabla_grupo(goal: EstadoST, grupo: Sequence[int]) -> bytearray:
+    """
+    BFS retrógrado desde el goal sobre las posiciones de las fichas del grupo.
+    El hueco no es parte del estado: una ficha del grupo pasa a cualquier casilla
+    vecina que no ocupe otra del grupo (costo 1). Cada movimiento real cambia a
+    lo sumo un grupo y en a lo sumo 1, así que la suma es admisible y consistente.
+    Memoria: la tabla (1 byte por rango) más los rangos de dos niveles.
+    """
+    n = _n_from_state(goal)
+    N = n * n
+    k = len(grupo)
+    vecinos = tabla_movimientos(n)
+    tam = tamano_tabla(N, k)
+    if tam > TAM_MAXIMO_GRUPO:
+        raise ValueError(f"Grupo de {k} fichas en {n}x{n}: {tam} entradas (máximo {TAM_MAXIMO_GRUPO}); "
+                         "use grupos más chicos")
+    # peso de cada dígito del rango (base mixta N, N-1, ...)
+    pesos = [tamano_tabla(N - i - 1, k - i - 1) for i in range(k)]
+
+    tabla = bytearray([SIN_VISITAR]) * tam
+    rango0 = rango_posiciones([goal.index(t) for t in grupo], N)
+    tabla[rango0] = 0
+    nivel = array("q", [rango0])
+    d = 0
+    while nivel:
+        d += 1
+        siguiente = array("q")
+        for rango in nivel:
+            pos = posiciones_desde_rango(rango, k, N)
+            ocupadas = 0
+            for p in pos:
+                ocupadas |= 1 << p
+            for j, c in enumerate(pos):
+                for v in vecinos[c]:
+                    if (ocupadas >> v) & 1:
+                        continue
+                    # rango con la ficha j en v en vez de c: cambia su dígito y el de
+                    # las fichas posteriores que quedan de distinto lado
+                    dj = v - c
+                    nuevo = rango
+                    for i, p in enumerate(pos):
+                        if i < j:
+                            dj -= (p < v) - (p < c)
+                        elif i > j:
+                            nuevo += pesos[i] * ((c < p) - (v < p))
+                    nuevo += pesos[j] * dj
+                    if tabla[nuevo] == SIN_VISITAR:
+                        tabla[nuevo] = d
+                        siguiente.append(nuevo)
+        nivel = siguiente
+    return tabla
+
+def construir_pdb(goal: EstadoST, particion: Particion) -> List[bytearray]:
+    _validar_particion(goal, particion)
+    return [construir_tabla_grupo(goal, grupo) for grupo in particion]
+
+def _validar_particion(goal: EstadoST, particion: Particion) -> None:
+    fichas = [t for grupo in particion for t in grupo]
+    if len(fichas) != len(set(fichas)):
+        raise ValueError("La partición de la PDB no es disjunta")
+    if set(fichas) != {v for v in goal if v != 0}:
+        raise ValueError("La partición de la PDB debe cubrir todas las fichas")
+
+# --- Archivo versionado + mmap --------------------------------------------------
+# Cabecera común (archivo_tablas) | tablas concatenadas
+
+def guardar_pdb(ruta: str, goal: EstadoST, particion: Particion, tablas: List[bytearray]) -> None:
+    n = _n_from_state(goal)
+    offsets, off = [], 0
+    for t in tablas:
+        offsets.append(off)
+        off += len(t)
+    meta = {
+        "n": n, "goal": list(goal), "particion": particion,
+        "offsets": offsets, "tamanos": [len(t) for t in tablas],
+    }
+    guardar_tabla(ruta, MAGIC, VERSION, meta, tablas)
+
+def cargar_pdb(ruta: str) -> Tuple[dict, List[memoryview], mmap.mmap]:
+    """Abre la PDB con mmap; devuelve (meta, tablas, mm). Las tablas son vistas del mmap."""
+    with open(ruta, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        meta, inicio = leer_cabecera(mm, ruta, MAGIC, VERSION, "PDB")
+    except ValueError:
+        mm.close()
+        raise
+    vista = memoryview(mm)
+    tablas = [vista[inicio + off: inicio + off + tam]
+              for off, tam in zip(meta["offsets"], meta["tamanos"])]
+    return meta, tablas, mm
+
+def ruta_pdb(goal: EstadoST, particion: Particion, directorio: str = DIR_CACHE) -> str:
+    firma = json.dumps({"goal": list(goal), "particion": particion, "v": VERSION})
+    digest = hashlib.sha1(firma.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(directorio, f"pdb_n{_n_from_state(goal)}_{digest}.bin")
+
+# --- Heurística ---------------------------------------------------------------------
+
+def h_pdb_factory(goal: EstadoST, particion: Optional[Particion] = None,
+                  ruta: Optional[str] = None, guardar: bool = True) -> Callable[[EstadoST], float]:
+    """
+    h(s) = suma de las tablas de cada grupo. Construye y guarda la PDB si no existe;
+    con guardar=False la construye solo en memoria (goals de un solo uso, p.ej. la
+    heurística inversa de MM).
+    """
+    n = _n_from_state(goal)
+    N = n * n
+    if particion is None:
+        if n not in PARTICIONES_DEFECTO:
+            raise ValueError(f"No hay partición PDB por defecto para n={n} (solo 3x3 y 4x4); "
+                             f"pase particion con grupos de hasta {TAM_MAXIMO_GRUPO} entradas")
+        particion = PARTICIONES_DEFECTO[n]
+    particion = [list(g) for g in particion]
+    ruta = ruta or ruta_pdb(goal, particion)
+
+    if not os.path.exists(ruta) and not guardar:
+        tablas, mm = construir_pdb(goal, particion), None
+    else:
+        if not os.path.exists(ruta):
+            _log.info("construyendo PDB %s (grupos %s)", ruta, [len(g) for g in particion])
+            guardar_pdb(ruta, goal, particion, construir_pdb(goal, particion))
+        meta, tablas, mm = cargar_pdb(ruta)
+        if meta["goal"] != list(goal) or meta["particion"] != particion:
+            raise ValueError(f"{ruta}: la PDB no corresponde al goal/partición pedidos")
+
+    grupos = [tuple(g) for g in particion]
+    grupo_de = {t: i for i, g in enumerate(grupos) for t in g}
+
+    def _valor_grupo(i: int, pos: Sequence[int]) -> int:
+        return tablas[i][rango_posiciones(pos, N)]
+
+    def h(s: EstadoST) -> float:
+        if isinstance(s, int):
+            s = desempaquetar_estado(s, n)
+        donde = [0] * N
+        for idx, v in enumerate(s):
+            donde[v] = idx
+        total = 0
+        for i, g in enumerate(grupos):
+            total += _valor_grupo(i, [donde[t] for t in g])
+        return float(total)
+
+    # solo cambia el grupo de la ficha movida
+    def update(parent_h: float, moved_tile: int, from_idx: int, to_idx: int, hijo) -> float:
+        if isinstance(hijo, int):
+            hijo = desempaquetar_estado(hijo, n)
+        i = grupo_de[moved_tile]
+        nuevo = [hijo.index(t) for t in grupos[i]]
+        viejo = [from_idx if t == moved_tile else p for t, p in zip(grupos[i], nuevo)]
+        return parent_h - _valor_grupo(i, viejo) + _valor_grupo(i, nuevo)
+
+    h.update = update
+    h.mm = mm  # mantiene vivo el mmap mientras viva h
+    return h
@@ -1,13 +1,19 @@
 # -*- coding: utf-8 -*-
 from collections import deque
 
-def dfs_iterativo(grafo, inicio, objetivo):
+# stats: EstadisticasBusqueda opcional (ver estadisticas.py) en dfs/bfs
+
+def dfs_iterativo(grafo, inicio, objetivo, stats=None):
+    if stats is not None:
+        grafo = stats.medir_grafo(grafo)
     frontera = [[inicio]]            # cada elemento es un camino
     expandidos = 0
     while frontera:
         camino = frontera.pop()      # LIFO
         nodo = camino[-1]
         expandidos += 1
+        if stats is not None:
+            stats.al_expandir(nodo, len(camino) - 1, len(camino) - 1, len(frontera) + 1)
         if nodo == objetivo:
             return camino, expandidos
         for hijo in grafo.get(nodo, []):
@@ -15,7 +21,9 @@ def dfs_iterativo(grafo, inicio, objetivo):
                 frontera.append(camino + [hijo])
     return None, expandidos
 
-def bfs_iterativo(grafo, inicio, objetivo):
+def bfs_iterativo(grafo, inicio, objetivo, stats=None):
+    if stats is not None:
+        grafo = stats.medir_grafo(grafo)
     frontera = deque([[inicio]])     # cada elemento es un camino
     expandidos = 0
     visitado = set([inicio])
@@ -23,6 +31,8 @@ def bfs_iterativo(grafo, inicio, objetivo):
         camino = frontera.popleft()  # FIFO
         nodo = camino[-1]
         expandidos += 1
+        if stats is not None:
+            stats.al_expandir(nodo, len(camino) - 1, len(camino) - 1, len(frontera) + 1)
         if nodo == objetivo:
             return camino, expandidos
         for hijo in grafo.get(nodo, []):
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Sesión de búsqueda: muchas instancias de sliding tile con el mismo goal y la
+misma configuración.
+
+Armar la heurística (tablas por goal, conflicto lineal, PDB con mmap, WD) y el
+grafo cuesta bastante más que resolver un 3x3 fácil; la sesión lo hace una vez
+y solve()/solve_many() solo buscan.
+
+    sesion = SesionBusqueda(goal, h_manhattan_linear_conflict_factory)
+    for camino, costo, expandidos in sesion.solve_many(estados):
+        ...
+
+Los diccionarios internos de cada búsqueda no se reutilizan entre instancias:
+en CPython dict.clear() libera la tabla, así que vaciarlos no ahorra nada
+frente a crearlos de nuevo.
+"""
+from __future__ import annotations
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+from agente___.algorithms.heuristics import EstadoST, _n_from_state
+from agente___.algorithms.informed import a_estrella, greedy_codicioso, ida_estrella
+from agente___.algorithms.npuzzle_utils import empaquetar_estado
+from agente___.environments.sliding_graph import SlidingLazyGraph, tabla_movimientos
+
+MOTORES = {"a*": a_estrella, "greedy": greedy_codicioso, "ida*": ida_estrella}
+
+class SesionBusqueda:
+    """
+    - h_factory: factory de heurística (p.ej. h_pdb_factory); se llama una sola vez.
+    - algoritmo: "a*" | "greedy" | "ida*".
+    - empaquetado: buscar con estados empaquetados en un int.
+    - opciones: se pasan tal cual al motor en cada búsqueda (desempate,
+      indexado, max_expansiones, deadline_ms, cancelar, ...).
+    """
+    def __init__(self, goal: EstadoST, h_factory: Callable, algoritmo: str = "a*",
+                 empaquetado: bool = False, **opciones):
+        if algoritmo not in MOTORES:
+            raise ValueError(f"Algoritmo no soportado en la sesión: {algoritmo} (use {', '.join(MOTORES)})")
+        self.goal = tuple(goal)
+        self.n = _n_from_state(self.goal)
+        self.algoritmo = algoritmo
+        self.empaquetado = empaquetado
+        self.opciones = opciones
+        self.h = h_factory(self.goal)
+        self.h(self.goal)                   # fuerza la carga de tablas perezosas (WD, PDB)
+        tabla_movimientos(self.n)
+        self.grafo = SlidingLazyGraph(self.n)
+        self._motor = MOTORES[algoritmo]
+        self._meta = empaquetar_estado(self.goal) if empaquetado else self.goal
+        self.resueltas = 0
+
+    def solve(self, inicio: EstadoST) -> Tuple[Optional[list], float, int]:
+        """(camino, costo, expandidos) como el motor; el camino va en la representación de búsqueda."""
+        if self.empaquetado:
+            inicio = empaquetar_estado(inicio)
+        r = self._motor(self.grafo, inicio, self._meta, self.h, **self.opciones)
+        self.resueltas += 1
+        return r
+
+    def solve_many(self, estados: Iterable[EstadoST]) -> Iterator[Tuple[Optional[list], float, int]]:
+        """Resuelve en orden y entrega cada resultado apenas termina (acepta iteradores infinitos)."""
+        for inicio in estados:
+            yield self.solve(inicio)
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+Tabla completa de distancias exactas para tableros pequeños (3x3: 181440 estados).
+
+- Un BFS retrógrado desde el goal llena un bytearray indexado por el rango de
+  Lehmer del estado (npuzzle_utils.rango_permutacion) con la distancia óptima.
+- La tabla se guarda versionada en agente___/data/cache y se lee en milisegundos.
+- solve_by_table baja por la tabla (vecino con distancia d-1): solución óptima
+  en O(profundidad) sin búsqueda.
+- h_exacta_factory da h*(s); verificar_heuristica recorre todo el espacio y
+  cuenta estados donde otra h sobreestima y aristas donde no es consistente.
+
+Uso:
+    camino, costo, pasos = solve_by_table(inicio)     # goal canónico 3x3
+    h = h_exacta_factory(goal)
+"""
+from __future__ import annotations
+import hashlib, json, logging, os
+from collections import deque
+from typing import Callable, Dict, Optional, Tuple
+
+from agente___.algorithms.archivo_tablas import DIR_CACHE, guardar_tabla as _guardar, leer_cabecera
+from agente___.algorithms.heuristics import EstadoST, _n_from_state
+from agente___.algorithms.npuzzle_utils import (
+    _goal_canonical, desempaquetar_estado, permutacion_desde_rango, rango_permutacion
+)
+from agente___.environments.sliding_graph import tabla_movimientos
+
+_log = logging.getLogger(__name__)
+
+MAGIC = b"NDST"
+VERSION = 1
+SIN_VISITAR = 255
+N_MAXIMO = 3            # 4x4 ya serían 16! entradas
+
+_TABLAS: Dict[EstadoST, bytearray] = {}   # memo por goal dentro del proceso
+
+def construir_tabla(goal: EstadoST) -> bytearray:
+    """BFS desde el goal; tabla[rango(s)] = distancia óptima (SIN_VISITAR si no es alcanzable)."""
+    n = _n_from_state(goal)
+    if n > N_MAXIMO:
+        raise ValueError(f"Tabla completa solo hasta {N_MAXIMO}x{N_MAXIMO} (n={n})")
+    N = n * n
+    vecinos = tabla_movimientos(n)
+    tam = 1
+    for i in range(2, N + 1):
+        tam *= i
+    tabla = bytearray([SIN_VISITAR]) * tam
+    tabla[rango_permutacion(goal)] = 0
+    cola = deque([(goal, goal.index(0))])
+    while cola:
+        s, hueco = cola.popleft()
+        d = tabla[rango_permutacion(s)] + 1
+        for idx in vecinos[hueco]:
+            lst = list(s)
+            lst[hueco], lst[idx] = lst[idx], 0
+            v = tuple(lst)
+            r = rango_permutacion(v)
+            if tabla[r] == SIN_VISITAR:
+                tabla[r] = d
+                cola.append((v, idx))
+    return tabla
+
+# --- Archivo versionado ---------------------------------------------------------
+# Cabecera común (archivo_tablas) | tabla
+
+def guardar_tabla(ruta: str, goal: EstadoST, tabla: bytearray) -> None:
+    _guardar(ruta, MAGIC, VERSION, {"n": _n_from_state(goal), "goal": list(goal)}, [tabla])
+
+def cargar_tabla(ruta: str) -> Tuple[dict, bytearray]:
+    with open(ruta, "rb") as f:
+        datos = f.read()
+    meta, inicio = leer_cabecera(datos, ruta, MAGIC, VERSION, "tabla de distancias")
+    return meta, bytearray(datos[inicio:])
+
+def ruta_tabla(goal: EstadoST, directorio: str = DIR_CACHE) -> str:
+    firma = json.dumps({"goal": list(goal), "v": VERSION})
+    digest = hashlib.sha1(firma.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(directorio, f"dist_n{_n_from_state(goal)}_{digest}.bin")
+
+def tabla_distancias(goal: Optional[EstadoST] = None, ruta: Optional[str] = None,
+                     guardar: bool = True) -> bytearray:
+    """
+    Tabla del goal (3x3 canónico por defecto): memoria -> disco -> BFS.
+    Con guardar=False un goal que no está en disco se construye sin guardarlo
+    ni memorizarlo (goals de un solo uso).
+    """
+    goal = tuple(goal) if goal is not None else _goal_canonical(N_MAXIMO)
+    tabla = _TABLAS.get(goal)
+    if tabla is not None:
+        return tabla
+    ruta = ruta or ruta_tabla(goal)
+    if os.path.exists(ruta):
+        meta, tabla = cargar_tabla(ruta)
+        if meta["goal"] != list(goal):
+            raise ValueError(f"{ruta}: la tabla no corresponde al goal pedido")
+    elif not guardar:
+        return construir_tabla(goal)
+    else:
+        _log.info("construyendo tabla de distancias %s", ruta)
+        tabla = construir_tabla(goal)
+        guardar_tabla(ruta, goal, tabla)
+    _TABLAS[goal] = tabla
+    return tabla
+
+# --- Consultas ----------------------------------------------------------------------
+
+def distancia_exacta(estado: EstadoST, goal: Optional[EstadoST] = None) -> Optional[int]:
+    """Distancia óptima a goal, o None si el estado no es alcanzable."""
+    d = tabla_distancias(goal)[rango_permutacion(estado)]
+    return None if d == SIN_VISITAR else d
+
+def solve_by_table(inicio: EstadoST, goal: Optional[EstadoST] = None):
+    """
+    Camino óptimo bajando por la tabla: en cada paso, el vecino a distancia d-1.
+    Retorna (camino, costo_total, expandidos) como los motores de búsqueda.
+    """
+    tabla = tabla_distancias(goal)
+    n = _n_from_state(inicio)
+    vecinos = tabla_movimientos(n)
+    s = tuple(inicio)
+    d = tabla[rango_permutacion(s)]
+    if d == SIN_VISITAR:
+        return None, float("inf"), 0
+    camino = [s]
+    hueco = s.index(0)
+    while d > 0:
+        for idx in vecinos[hueco]:
+            lst = list(s)
+            lst[hueco], lst[idx] = lst[idx], 0
+            v = tuple(lst)
+            if tabla[rango_permutacion(v)] == d - 1:
+                s, hueco, d = v, idx, d - 1
+                camino.append(s)
+                break
+    return camino, float(len(camino) - 1), len(camino) - 1
+
+def verificar_heuristica(h: Callable[[EstadoST], float],
+                         goal: Optional[EstadoST] = None) -> Dict[str, int]:
+    """
+    Compara h con la tabla en todos los estados alcanzables (3x3: 181440).
+    Cuenta sobreestima (h(s) > h*(s)), inconsistentes (aristas s->v con
+    h(s) > 1 + h(v)) y, si h tiene update, update_distinto (update != h(v)).
+    """
+    goal = tuple(goal) if goal is not None else _goal_canonical(N_MAXIMO)
+    tabla = tabla_distancias(goal)
+    n = _n_from_state(goal)
+    vecinos = tabla_movimientos(n)
+    update = getattr(h, "update", None)
+    cuenta = {"estados": 0, "sobreestima": 0, "inconsistentes": 0, "update_distinto": 0}
+    for r, d in enumerate(tabla):
+        if d == SIN_VISITAR:
+            continue
+        s = permutacion_desde_rango(r, n * n)
+        hs = h(s)
+        cuenta["estados"] += 1
+        if hs > d:
+            cuenta["sobreestima"] += 1
+        hueco = s.index(0)
+        for idx in vecinos[hueco]:
+            lst = list(s)
+            lst[hueco], lst[idx] = lst[idx], 0
+            v = tuple(lst)
+            hv = h(v)
+            if hs > 1 + hv:
+                cuenta["inconsistentes"] += 1
+            if update is not None and update(hs, s[idx], idx, hueco, v) != hv:
+                cuenta["update_distinto"] += 1
+    return cuenta
+
+def h_exacta_factory(goal: EstadoST, guardar: bool = True) -> Callable[[EstadoST], float]:
+    """h*(s) exacta (admisible y consistente); inf si s no es alcanzable."""
+    tabla = tabla_distancias(goal, guardar=guardar)
+    n = _n_from_state(goal)
+
+    def h(s: EstadoST) -> float:
+        if isinstance(s, int):
+            s = desempaquetar_estado(s, n)
+        d = tabla[rango_permutacion(s)]
+        return float("inf") if d == SIN_VISITAR else float(d)
+    return h
@@ -35,14 +35,28 @@ def get_costo(camino, grafo_ponderado, *, raise_on_missing=True):
 
 
 #costo
-def camino_menor_costo_ucs(grafo_ponderado, inicio, objetivo):
+def camino_menor_costo_ucs(grafo_ponderado, inicio, objetivo, stats=None,
+                           max_expansiones=None, deadline_ms=None, cancelar=None,
+                           indexado=False):
     """
     Uniform-Cost Search (cola de prioridad por costo acumulado).
     - Procesa primero el camino con MENOR costo.
     - Requiere costos positivos.
+    - stats: EstadisticasBusqueda opcional (ver estadisticas.py).
+    - max_expansiones/deadline_ms/cancelar: al cortar lanza BusquedaAbortada
+      (ver control.py) con cota_f = costo del último camino desencolado.
+    - indexado: HeapIndexado con decrease-key (un nodo por entrada, padres en
+      un dict) en vez de encolar caminos completos duplicados.
     Devuelve: (camino, costo_total, expandidos)
     """
     from heapq import heappush, heappop
+    from agente___.algorithms.control import crear_control
+
+    control = crear_control(max_expansiones, deadline_ms, cancelar)
+    if stats is not None:
+        grafo_ponderado = stats.medir_grafo(grafo_ponderado)
+    if indexado:
+        return _ucs_indexado(grafo_ponderado, inicio, objetivo, stats, control)
 
     frontera = []                       
     heappush(frontera, (0.0, [inicio]))
@@ -53,16 +67,69 @@ def camino_menor_costo_ucs(grafo_ponderado, inicio, objetivo):
         costo, camino = heappop(frontera)
         nodo = camino[-1]
         expandidos += 1
+        if stats is not None:
+            if costo > mejor_costo[nodo]:
+                stats.pops_obsoletos += 1  # se reexpande con un costo ya superado
+            stats.al_expandir(nodo, costo, costo, len(frontera) + 1)
 
         if nodo == objetivo:
             return camino, costo, expandidos
+        if control is not None:
+            # sin h: el "mejor" parcial es el camino en curso
+            motivo = control.verificar(nodo, float("inf"), costo, expandidos)
+            if motivo is not None:
+                raise control.abortar(motivo, expandidos, camino)
 
         #vecinos con sus pesos
         for vecino, w in grafo_ponderado.get(nodo, {}).items():
             nuevo = costo + float(w)
             # relajación: solo empujar si encontramos una ruta más barata
             if vecino not in mejor_costo or nuevo < mejor_costo[vecino]:
+                if stats is not None:
+                    stats.pushes += 1
+                    if vecino in mejor_costo:
+                        stats.reabiertos += 1
                 mejor_costo[vecino] = nuevo
                 heappush(frontera, (nuevo, camino + [vecino]))
 
-    return None, float("inf"), expandidos
\ No newline at end of file
+    return None, float("inf"), expandidos
+
+
+def _ucs_indexado(grafo_ponderado, inicio, objetivo, stats, control):
+    """UCS con HeapIndexado: cada nodo se expande una sola vez."""
+    from agente___.algorithms.heap_indexado import HeapIndexado
+    from agente___.algorithms.informed import _reconstruir_camino
+
+    frontera = HeapIndexado()
+    frontera.actualizar((0.0, inicio), inicio)     # clave (costo, nodo)
+    padre = {}
+    cerrado = set()
+    expandidos = 0
+    try:
+        while frontera:
+            (costo, _), nodo = frontera.pop()
+            cerrado.add(nodo)
+            expandidos += 1
+            if stats is not None:
+                stats.al_expandir(nodo, costo, costo, len(frontera) + 1)
+
+            if nodo == objetivo:
+                return _reconstruir_camino(padre, nodo), costo, expandidos
+            if control is not None:
+                motivo = control.verificar(nodo, float("inf"), costo, expandidos)
+                if motivo is not None:
+                    raise control.abortar(motivo, expandidos, _reconstruir_camino(padre, nodo))
+
+            for vecino, w in grafo_ponderado.get(nodo, {}).items():
+                if vecino in cerrado:
+                    continue
+                nuevo = costo + float(w)
+                if vecino in frontera and stats is not None and nuevo < frontera.clave(vecino)[0]:
+                    stats.reabiertos += 1
+                if frontera.actualizar((nuevo, vecino), vecino):   # nuevo o decrease-key
+                    padre[vecino] = nodo
+        return None, float("inf"), expandidos
+    finally:
+        if stats is not None:
+            stats.pushes += frontera.pushes
+            stats.decrementos += frontera.decrementos
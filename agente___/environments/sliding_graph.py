@@ -1,37 +1,145 @@
-from typing import Dict, Tuple, Iterable
+from typing import Dict, List, Tuple, Iterable, Iterator, Optional
 from agente___.algorithms.heuristics import EstadoST, _n_from_state, _rc
+from agente___.algorithms.npuzzle_utils import (
+    hueco_empaquetado, ficha_empaquetada, bits_por_ficha, mover_empaquetado
+)
+
+# --- Códigos de movimiento -----------------------------------------------------
+# Un paso queda determinado por hacia dónde va el hueco: 2 bits alcanzan.
+# MOVIMIENTOS[codigo] es la letra (U/D/L/R = el hueco sube/baja/izq/der) y
+# codigo ^ 1 es el movimiento inverso (U<->D, L<->R).
+MOVIMIENTOS = "UDLR"
+
+def codigo_movimiento(hueco: int, hueco_v: int) -> int:
+    """Código 0..3 del paso que lleva el hueco de hueco a hueco_v (no necesita n)."""
+    d = hueco_v - hueco
+    if d == -1:
+        return 2
+    if d == 1:
+        return 3
+    return 0 if d < 0 else 1
+
+# --- Tablas de movimientos precalculadas ---------------------------------------
+# _MOVIMIENTOS[n][idx0] = índices vecinos del hueco en idx0, en el orden
+# arriba, abajo, izquierda, derecha (el mismo que usaba get()).
+_MOVIMIENTOS: Dict[int, Tuple[Tuple[int, ...], ...]] = {}
+_N_POR_LARGO: Dict[int, int] = {}
+
+def tabla_movimientos(n: int) -> Tuple[Tuple[int, ...], ...]:
+    tabla = _MOVIMIENTOS.get(n)
+    if tabla is None:
+        filas = []
+        for idx0 in range(n * n):
+            r0, c0 = _rc(idx0, n)
+            vecinos = []
+            if r0 > 0:
+                vecinos.append(idx0 - n)
+            if r0 < n - 1:
+                vecinos.append(idx0 + n)
+            if c0 > 0:
+                vecinos.append(idx0 - 1)
+            if c0 < n - 1:
+                vecinos.append(idx0 + 1)
+            filas.append(tuple(vecinos))
+        tabla = _MOVIMIENTOS[n] = tuple(filas)
+    return tabla
 
 class SlidingLazyGraph(dict):
     """
     "Grafo" perezoso para sliding tile nxn compatible con a_estrella(grafo,...).
     Implementa .get(estado, {}) devolviendo {sucesor: 1.0, ...} sin precomputar todo.
+    Acepta estados como tupla o empaquetados en un int (ver npuzzle_utils);
+    para estos últimos hay que indicar n al construir el grafo.
+
+    Camino rápido para los motores: neighbors()/expandir() reciben la posición
+    del hueco y la del hueco del padre, así no se busca el 0 ni se genera el
+    movimiento que deshace el anterior.
     """
+    def __init__(self, n: Optional[int] = None):
+        super().__init__()
+        self.n = n
+
     def __getitem__(self, key):
         # no usamos __getitem__ para evitar KeyError; usamos get() abajo.
         raise KeyError
 
-    def get(self, s: EstadoST, default=None) -> Dict[EstadoST, float]:
-        n = _n_from_state(s)
-        idx0 = s.index(0)
-        r0, c0 = _rc(idx0, n)
-        sucesores: Dict[EstadoST, float] = {}
+    def _n_de(self, s) -> int:
+        if isinstance(s, int):
+            if self.n is None:
+                raise ValueError("SlidingLazyGraph necesita n para estados empaquetados")
+            return self.n
+        n = _N_POR_LARGO.get(len(s))
+        if n is None:
+            n = _N_POR_LARGO[len(s)] = _n_from_state(s)
+        return n
+
+    def hueco(self, s) -> int:
+        if isinstance(s, int):
+            return hueco_empaquetado(s, self._n_de(s))
+        return s.index(0)
 
-        def swap(idx_a, idx_b):
+    def expandir(self, s, blank_idx: int, prev_blank: int = -1) -> Iterator[Tuple[object, int, int]]:
+        """Genera (hijo, hueco_hijo, ficha_movida) sin volver a prev_blank."""
+        n = self._n_de(s)
+        if isinstance(s, int):
+            b = bits_por_ficha(n)
+            mask = (1 << b) - 1
+            for idx in tabla_movimientos(n)[blank_idx]:
+                if idx == prev_blank:
+                    continue
+                v = (s >> (idx * b)) & mask
+                yield s + (v << (blank_idx * b)) - (v << (idx * b)), idx, v
+            return
+        for idx in tabla_movimientos(n)[blank_idx]:
+            if idx == prev_blank:
+                continue
             lst = list(s)
-            lst[idx_a], lst[idx_b] = lst[idx_b], lst[idx_a]
-            return tuple(lst)
-
-        # arriba
-        if r0 > 0:
-            sucesores[swap(idx0, idx0 - n)] = 1.0
-        # abajo
-        if r0 < n - 1:
-            sucesores[swap(idx0, idx0 + n)] = 1.0
-        # izquierda
-        if c0 > 0:
-            sucesores[swap(idx0, idx0 - 1)] = 1.0
-        # derecha
-        if c0 < n - 1:
-            sucesores[swap(idx0, idx0 + 1)] = 1.0
-
-        return sucesores if sucesores else (default or {})
\ No newline at end of file
+            v = lst[idx]
+            lst[blank_idx] = v
+            lst[idx] = 0
+            yield tuple(lst), idx, v
+
+    def neighbors(self, state, blank_idx: int, prev_blank: int = -1) -> Iterator[Tuple[object, int]]:
+        """Genera (hijo, hueco_hijo) saltando el movimiento que deshace el anterior."""
+        for hijo, idx, _ in self.expandir(state, blank_idx, prev_blank):
+            yield hijo, idx
+
+    def mover(self, s, hueco: int, codigo: int) -> Tuple[object, int]:
+        """(hijo, hueco_hijo) al mover el hueco según codigo (ver MOVIMIENTOS)."""
+        n = self._n_de(s)
+        idx = hueco + (-n, n, -1, 1)[codigo]
+        if isinstance(s, int):
+            return mover_empaquetado(s, hueco, idx, n), idx
+        lst = list(s)
+        lst[hueco] = lst[idx]
+        lst[idx] = 0
+        return tuple(lst), idx
+
+    def cadena_movimientos(self, camino: List) -> str:
+        """Camino de estados -> "UDLR..." (un carácter por paso)."""
+        huecos = [self.hueco(s) for s in camino]
+        return "".join(MOVIMIENTOS[codigo_movimiento(a, b)] for a, b in zip(huecos, huecos[1:]))
+
+    def aplicar_movimientos(self, inicio, cadena: str) -> List:
+        """Reproduce una cadena "UDLR..." desde inicio y devuelve el camino de estados."""
+        camino = [inicio]
+        s, hueco = inicio, self.hueco(inicio)
+        for letra in cadena:
+            s, hueco = self.mover(s, hueco, MOVIMIENTOS.index(letra))
+            camino.append(s)
+        return camino
+
+    def get(self, s: EstadoST, default=None) -> Dict[EstadoST, float]:
+        sucesores = {hijo: 1.0 for hijo, _, _ in self.expandir(s, self.hueco(s))}
+        return sucesores if sucesores else (default or {})
+
+    def movimiento(self, s, v) -> Tuple[int, int, int]:
+        """(ficha, desde, hasta) del paso s -> v: la ficha ocupa el hueco de s."""
+        if isinstance(s, int):
+            n = self._n_de(s)
+            hasta = hueco_empaquetado(s, n)
+            desde = hueco_empaquetado(v, n)
+            return ficha_empaquetada(s, desde, n), desde, hasta
+        hasta = s.index(0)
+        desde = v.index(0)
+        return s[desde], desde, hasta
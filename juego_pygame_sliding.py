@@ -1,15 +1,18 @@
 # juego_pygame_sliding.py
 # -*- coding: utf-8 -*-
-import sys, os, time, random
+import sys, os, time, random, threading
 import pygame
 
 # === IMPORTS DE TU PROYECTO (ajusta si tu estructura difiere) ===
 from agente___.environments.sliding_graph import SlidingLazyGraph
-from agente___.algorithms.informed import a_estrella, greedy_codicioso
+from agente___.algorithms.informed import a_estrella, greedy_codicioso, ida_estrella, ara_estrella
 from agente___.algorithms.heuristics import (
     h_manhattan_linear_conflict_factory, h_manhattan_factory
 )
 from agente___.algorithms.npuzzle_utils import generar_estado, es_soluble
+from agente___.algorithms.control import TokenCancelacion, BusquedaAbortada, CANCELADO
+from agente___.algorithms.estadisticas import EstadisticasBusqueda
+from agente___.algorithms.cache_soluciones import CacheSoluciones
 
 # ============ CONFIGURACIÓN ============
 N = 5                                  # tamaño del tablero NxN
@@ -19,6 +22,13 @@ MARGIN = 20                            # margen exterior
 FONT_SIZE = 20
 FPS = 60
 ANIM_DELAY_MS = 120                   # ms entre pasos de animación
+USE_IDA = False                        # True: resolver con IDA* (memoria O(profundidad))
+SOLVE_BUDGET_MS = 3000                 # R: mejor camino en X ms con ARA* (None = A* óptimo sin límite)
+SOLVE_DEADLINE_MS = 20000              # A*/IDA*: al cortar, plan hasta el nodo más cercano a la meta
+ARA_W0 = 5.0                           # peso inicial de ARA*
+PROGRESS_EVERY = 500                   # expansiones entre actualizaciones del panel al resolver
+CACHE_STATES = 200_000                 # estados máximos en la caché de soluciones (LRU)
+ETIQUETA_COTA_ARA = "Cota costo/óptimo <="   # panel en modo ARA*
 
 # Colores
 BG = (245, 246, 248)
@@ -84,12 +94,14 @@ def draw_board(screen, font, state, n, info=None):
     # overlay info
     if info:
         overlay_lines = [
-            f"R: resolver (A* + Linear Conflict)",
-            f"N: sugerir 1 paso (Greedy + LC)",
+            f"R: resolver (A*/ARA* + Linear Conflict)",
+            f"N: sugerir 1 paso (caché óptima o Greedy + LC)",
             f"",
             f"Estado objetivo: {goal_canon(n)}",
             f"Algoritmo: {info.get('algo','-')}  Heurística: {info.get('heur','-')}",
             f"Pasos: {info.get('pasos','-')}  Tiempo(ms): {info.get('ms','-')}  Expandidos: {info.get('exp','-')}",
+            f"{info.get('etiqueta_f', 'Cota f')}: {info.get('f','-')}",
+            f"Caché: {info.get('cache','-')}",
         ]
         x0 = rect_b.right + 20
         y0 = MARGIN
@@ -100,8 +112,11 @@ def draw_board(screen, font, state, n, info=None):
 
 # ============ LÓGICA DEL AGENTE ============
 class PuzzleAgent:
-    def __init__(self, n):
+    def __init__(self, n, use_ida=USE_IDA, budget_ms=SOLVE_BUDGET_MS, deadline_ms=SOLVE_DEADLINE_MS):
         self.n = n
+        self.use_ida = use_ida
+        self.budget_ms = budget_ms
+        self.deadline_ms = deadline_ms   # solo A*/IDA* (ARA* usa budget_ms)
         self.grafo = SlidingLazyGraph()
         self.goal = goal_canon(n)
         # Heurísticas precompiladas
@@ -110,24 +125,161 @@ class PuzzleAgent:
         self.plan = []            # lista de estados (camino a reproducir)
         self.anim_on = False
         self._last_step_ts = 0    # timestamp para ritmo de animación
+        # resolución en segundo plano (ver solve_async/poll)
+        self._token = None        # TokenCancelacion del solve en curso (None = ninguno)
+        self._resultado = None    # (token, inicio, (plan, info, optimo)) que deja el hilo al terminar
+        self.progreso = None      # {"exp", "f"[, "etiqueta_f"]} del solve en curso, actualizado por el hilo
+        # caminos óptimos ya resueltos: seguir un plan no obliga a buscar de nuevo
+        self.cache = CacheSoluciones(CACHE_STATES)
 
-    def solve_astar(self, start):
+    def _desde_cache(self, start):
+        """(plan, info) si start está en un camino óptimo ya resuelto; si no, None."""
+        hit = self.cache.buscar(start)
+        if hit is None:
+            return None
+        plan, distancia = hit
+        return plan, {"algo": "caché", "heur": "-", "pasos": distancia,
+                      "ms": 0.0, "exp": 0, "f": float(distancia)}
+
+    def _registrar(self, start, plan, optimo):
+        if optimo and (plan or start == self.goal):
+            self.cache.guardar([start] + plan)
+
+    def _resolver(self, start, cancelar=None, stats=None, al_mejorar=None):
+        """Corre el motor configurado; devuelve (plan, info, optimo).
+        Solo lanza BusquedaAbortada si se canceló; si A*/IDA* llegan al deadline,
+        el plan lleva al nodo expandido más cercano a la meta (e.camino_parcial).
+        al_mejorar(camino, costo, cota): solo ARA*, en cada solución mejor."""
         t0 = time.perf_counter()
-        path, cost, expanded = a_estrella(self.grafo, start, self.goal, self.hA)
+        bound = 1.0
+        if self.budget_ms is not None:
+            path, cost, expanded, bound = ara_estrella(
+                self.grafo, start, self.goal, self.hA,
+                deadline_ms=self.budget_ms, w_inicial=ARA_W0, al_mejorar=al_mejorar,
+                cancelar=cancelar, stats=stats)
+        else:
+            motor = ida_estrella if self.use_ida else a_estrella
+            try:
+                path, cost, expanded = motor(self.grafo, start, self.goal, self.hA,
+                                             deadline_ms=self.deadline_ms, cancelar=cancelar, stats=stats)
+            except BusquedaAbortada as e:
+                if e.motivo == CANCELADO:
+                    raise
+                return self._parcial(start, e, time.perf_counter() - t0)
         t1 = time.perf_counter()
         if path and len(path) > 0 and path[0] == start:
             path = path[1:]  # remover estado actual
-        self.plan = path or []
-        self.anim_on = False
-        return {
-            "algo": "A*",
+        info = {
+            "algo": (f"ARA* (cota {bound:.2f})" if self.budget_ms is not None
+                     else ("IDA*" if self.use_ida else "A*")),
             "heur": "Linear Conflict",
             "pasos": (len(path) if path else 0),
             "ms": round((t1 - t0) * 1000.0, 1),
-            "exp": expanded
+            "exp": expanded,
+            "f": cost if path else "-",
         }
+        if self.budget_ms is not None:
+            # ARA* no da una cota f: su garantía es costo <= cota * óptimo
+            info["etiqueta_f"] = ETIQUETA_COTA_ARA
+            info["f"] = f"{bound:.2f}" if path else "-"
+        return path or [], info, bound <= 1.0  # ARA* solo es óptimo si llegó a cota 1
+
+    def _parcial(self, start, e, segundos):
+        """(plan, info, optimo) de una búsqueda cortada: camino al nodo con menor h."""
+        path = list(e.camino_parcial or [start])[1:]
+        return path, {
+            "algo": f"{'IDA*' if self.use_ida else 'A*'} cortado ({e.motivo}): más cercano h={e.mejor_h:g}",
+            "heur": "Linear Conflict",
+            "pasos": len(path),
+            "ms": round(segundos * 1000.0, 1),
+            "exp": e.expandidos,
+            "f": e.cota_f,    # cota inferior del óptimo (h consistente)
+        }, False
+
+    def solve_astar(self, start):
+        """Resuelve en el hilo actual (bloquea hasta terminar)."""
+        hit = self._desde_cache(start)
+        if hit is not None:
+            self.plan, info = hit
+        else:
+            self.plan, info, optimo = self._resolver(start)
+            self._registrar(start, self.plan, optimo)
+        self.plan = list(self.plan)
+        self.anim_on = False
+        return info
+
+    # --- resolución en segundo plano ---
+    @property
+    def solving(self):
+        return self._token is not None
+
+    def solve_async(self, start):
+        """Lanza el solve en un hilo; el loop principal llama poll() en cada frame."""
+        self.cancel_solve()
+        self.plan = []
+        self.anim_on = False
+        token = TokenCancelacion()
+        hit = self._desde_cache(start)
+        if hit is not None:
+            # sin hilo: poll() lo entrega en el próximo frame
+            self._token = token
+            self._resultado = (token, start, hit + (False,))
+            return
+
+        ara = self.budget_ms is not None
+
+        def al_progreso(evento):
+            if token is self._token:          # un solve viejo no pisa el panel
+                self.progreso["exp"] = evento["expandidos"]
+                if not ara:                   # A*: el f desencolado es cota inferior del óptimo
+                    self.progreso["f"] = evento["f"]
+
+        def al_mejorar(camino, costo, cota):
+            if token is self._token:
+                self.progreso["f"] = f"{cota:.2f}"
+
+        stats = EstadisticasBusqueda(traza=al_progreso, muestreo=PROGRESS_EVERY)
+        self._token = token
+        self.progreso = {"exp": 0, "f": "-"}
+        if ara:
+            self.progreso["etiqueta_f"] = ETIQUETA_COTA_ARA
+        threading.Thread(target=self._trabajo, args=(start, token, stats, al_mejorar if ara else None),
+                         daemon=True).start()
+
+    def _trabajo(self, start, token, stats, al_mejorar=None):
+        try:
+            resultado = self._resolver(start, cancelar=token, stats=stats, al_mejorar=al_mejorar)
+        except BusquedaAbortada:
+            return  # cancelado: el tablero cambió y el resultado ya no sirve
+        if not token.cancelado:
+            self._resultado = (token, start, resultado)
+
+    def poll(self):
+        """Si terminó el solve en curso fija el plan y devuelve su info; si no, None."""
+        hecho = self._resultado
+        if hecho is None or hecho[0] is not self._token:
+            return None
+        self._resultado = None
+        self._token = None
+        self.progreso = None
+        _, start, (plan, info, optimo) = hecho
+        self._registrar(start, plan, optimo)
+        self.plan = plan
+        self.anim_on = False
+        return info
+
+    def cancel_solve(self):
+        """Cancela el solve en curso (el hilo corta en su próxima expansión)."""
+        if self._token is not None:
+            self._token.cancelar()
+        self._token = None
+        self._resultado = None
+        self.progreso = None
 
     def suggest_greedy(self, start):
+        nxt = self.cache.siguiente(start)   # O(1) si start está en un plan óptimo
+        if nxt is not None:
+            return nxt
         path, _, _ = greedy_codicioso(self.grafo, start, self.goal, self.hG)
         if path and len(path) >= 2:
             return path[1]  # siguiente estado
@@ -187,7 +339,7 @@ def main():
     assert es_soluble(state, goal)
 
     agent = PuzzleAgent(N)
-    info = {"algo": "-", "heur": "-", "pasos": "-", "ms": "-", "exp": "-"}
+    info = {"algo": "-", "heur": "-", "pasos": "-", "ms": "-", "exp": "-", "f": "-"}
 
     running = True
     while running:
@@ -203,13 +355,16 @@ def main():
                 new_state = try_move(state, N, rc)
                 if new_state != state:
                     state = new_state
+                    agent.cancel_solve()  # el solve en curso ya no corresponde al tablero
                     agent.plan = []   # invalidar plan previo si el usuario mueve
                     agent.anim_on = False
 
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_r:
-                    # Resolver con A* + LC
-                    info = agent.solve_astar(state)
+                    # Resolver con A* + LC en segundo plano (el loop sigue dibujando)
+                    agent.solve_async(state)
+                    info = {"algo": "resolviendo...", "heur": "Linear Conflict",
+                            "pasos": "-", "ms": "-", "exp": 0, "f": "-"}
                 elif event.key == pygame.K_a:
                     # Animar plan (si existe)
                     if agent.plan:
@@ -220,14 +375,24 @@ def main():
                     nxt = agent.suggest_greedy(state)
                     if nxt:
                         state = nxt
+                        agent.cancel_solve()
                         agent.plan = []
                         agent.anim_on = False
                 elif event.key == pygame.K_s:
                     # Barajar un estado soluble
                     state = generar_estado(N, pasos_barajado=random.randint(40, 120))
+                    agent.cancel_solve()
                     agent.plan = []
                     agent.anim_on = False
-                    info = {"algo": "-", "heur": "-", "pasos": "-", "ms": "-", "exp": "-"}
+                    info = {"algo": "-", "heur": "-", "pasos": "-", "ms": "-", "exp": "-", "f": "-"}
+
+        # resultado / progreso del solve en segundo plano
+        resultado = agent.poll()
+        if resultado is not None:
+            info = resultado
+        elif agent.progreso is not None:
+            info.update(agent.progreso)
+        info["cache"] = agent.cache.resumen()
 
         # animación (si está activa)
         state, _finished = agent.animate_step(state)
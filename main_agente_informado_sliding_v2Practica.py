@@ -1,10 +1,12 @@
-from agente___.algorithms.informed import a_estrella, greedy_codicioso
+from agente___.algorithms.informed import a_estrella, greedy_codicioso, ida_estrella, a_estrella_bidireccional
 from agente___.algorithms.heuristics import (
     h_hamming_factory, h_manhattan_factory,
     h_manhattan_linear_conflict_factory, h_gaschnig_factory
 )
+from agente___.algorithms.pdb import h_pdb_factory
 from agente___.environments.sliding_graph import SlidingLazyGraph
-import argparse
+from agente___.algorithms.npuzzle_utils import empaquetar_estado, como_tupla
+import argparse, logging
 
 # Estado 3x3 (8-puzzle): 0 = vacío
 inicio = (6,8,3,
@@ -15,7 +17,7 @@ goal =  (1,2,3,
          4,5,6,
          7,8,0)
 
-def _select_heuristic(name: str, goal):
+def _select_heuristic(name: str, goal, guardar: bool = True):
     name = (name or "").lower()
     if name in ("hamming", "h"):
         return h_hamming_factory(goal)
@@ -25,6 +27,8 @@ def _select_heuristic(name: str, goal):
         return h_manhattan_linear_conflict_factory(goal)
     if name in ("gaschnig", "g"):
         return h_gaschnig_factory(goal)
+    if name in ("pdb", "pattern_db"):
+        return h_pdb_factory(goal, guardar=guardar)
     raise ValueError(f"Heurística no reconocida: {name}")
 
 
@@ -70,10 +74,12 @@ def paso(prev, curr):
     ficha = curr[i0_prev]
     return d, ficha
 
-def mostrar_trayectoria(camino, h_func=None, mostrar_costes=True):
+def mostrar_trayectoria(camino, h_func=None, mostrar_costes=True, n=None):
     if not camino:
         print("No hay solución.")
         return
+    # estados empaquetados (int) -> tuplas para dibujarlos
+    camino = [como_tupla(s, n) for s in camino]
     n = n_from_state(camino[0])
     g = 0.0
     print(f"Puzzle {n}x{n}\n")
@@ -96,23 +102,36 @@ def mostrar_trayectoria(camino, h_func=None, mostrar_costes=True):
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Agente informando para Sliding Tiles (Greedy / A*)")
-    parser.add_argument("--algo", choices=["a*", "greedy"], default="a*", help="Algoritmo de búsqueda")
-    parser.add_argument("--h", choices=["hamming", "manhattan", "linear_conflict", "gaschnig"], default="manhattan", help="Heurística admisible")
+    parser.add_argument("--algo", choices=["a*", "ida*", "mm", "greedy"], default="a*", help="Algoritmo de búsqueda (mm con pdb arma en memoria, sin guardar, la PDB inversa del inicio)")
+    parser.add_argument("--h", choices=["hamming", "manhattan", "linear_conflict", "gaschnig", "pdb"], default="manhattan", help="Heurística admisible")
+    parser.add_argument("--packed", action="store_true", help="Buscar con estados empaquetados en un int")
     parser.add_argument("--show-costs", action="store_true", default=True, help="Mostrar g, h, f durante la trayectoria")
     args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")   # avisos de tablas en construcción
 
     # Seleccionar heurística y grafo
     h = _select_heuristic(args.h, goal)
     # grafo ya declarado arriba
     print(f"[CLI] algoritmo={args.algo}  heurística={args.h}")
+    n = n_from_state(goal)
+    s0, meta = inicio, goal
+    if args.packed:
+        grafo = SlidingLazyGraph(n)
+        s0, meta = empaquetar_estado(inicio), empaquetar_estado(goal)
 
     if args.algo == "greedy":
-        camino, costo, expandidos = greedy_codicioso(grafo, inicio, goal, h)
+        camino, costo, expandidos = greedy_codicioso(grafo, s0, meta, h)
+    elif args.algo == "ida*":
+        camino, costo, expandidos = ida_estrella(grafo, s0, meta, h)
+    elif args.algo == "mm":
+        # misma heurística con goal = inicio; la PDB de ese goal se arma en memoria, sin cache
+        h_inv = _select_heuristic(args.h, inicio, guardar=False)
+        camino, costo, expandidos = a_estrella_bidireccional(grafo, s0, meta, h, h_inv)
     else:
-        camino, costo, expandidos = a_estrella(grafo, inicio, goal, h)
+        camino, costo, expandidos = a_estrella(grafo, s0, meta, h)
 
     if camino:
         print(f"Pasos: {len(camino)-1} | Costo: {costo:.0f} | Expandidos: {expandidos}")
-        mostrar_trayectoria(camino, h_func=h, mostrar_costes=args.show_costs)
+        mostrar_trayectoria(camino, h_func=h, mostrar_costes=args.show_costs, n=n)
     else:
         print("Sin solución.")
@@ -1,29 +1,28 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
-import argparse, time, csv, os
-from typing import Tuple, List
+import argparse, time, csv, io, json, logging, os, random, sys
+import multiprocessing as mp
+from typing import Dict, Tuple, List, Iterator
 
-from agente___.algorithms.informed import a_estrella, greedy_codicioso
+from agente___.algorithms.informed import (
+    a_estrella, greedy_codicioso, ida_estrella, a_estrella_bidireccional,
+    a_estrella_memoria_acotada, ara_estrella, GraphAdapter
+)
 from agente___.algorithms.heuristics import (
-    h_hamming_factory, h_manhattan_factory, h_manhattan_linear_conflict_factory
+    h_hamming_factory, h_manhattan_factory, h_manhattan_linear_conflict_factory,
+    h_walking_distance_factory, h_walking_distance_lc_factory
 )
+from agente___.algorithms.pdb import h_pdb_factory
+from agente___.algorithms.tabla_distancias import h_exacta_factory, solve_by_table, verificar_heuristica
+from agente___.algorithms.estadisticas import EstadisticasBusqueda
+from agente___.algorithms.control import BusquedaAbortada
 from agente___.environments.sliding_graph import SlidingLazyGraph
-from agente___.algorithms.npuzzle_utils import generar_estado, es_soluble
+from agente___.algorithms.npuzzle_utils import (
+    generar_estado, estado_aleatorio, es_soluble, empaquetar_estado
+)
 
 EstadoST = Tuple[int, ...]
 
-class GraphAdapter:
-    def __init__(self, base):
-        self.base = base
-    def get(self, s, default=None):
-        return self.base.get(s, default)
-    def __getitem__(self, s):
-        # devuelve siempre el diccionario de sucesores
-        return self.base.get(s, {})
-    def __contains__(self, s):
-        # asume que cualquier estado válido puede consultarse
-        return True
-
 def goal_canon(n: int) -> EstadoST:
     return tuple(list(range(1, n*n)) + [0])
 
@@ -35,81 +34,580 @@ def get_heuristic_factory(name: str):
         return h_manhattan_factory
     if name in ("linear_conflict", "mlc", "manhattan_lc", "lc"):
         return h_manhattan_linear_conflict_factory
+    if name in ("walking_distance", "wd"):
+        return h_walking_distance_factory
+    if name in ("wd_lc", "wd+lc"):
+        return h_walking_distance_lc_factory  # max(WD, Manhattan + conflicto lineal)
+    if name in ("pdb", "pattern_db"):
+        return h_pdb_factory
+    if name in ("exacta", "exact"):
+        return h_exacta_factory  # tabla completa (solo 3x3)
     raise ValueError(f"Heurística no soportada en benchmark: {name}")
 
-def run_once(algo: str, hname: str, grafo, inicio: EstadoST, goal: EstadoST):
-    h_factory = get_heuristic_factory(hname)
-    h = h_factory(goal)
+# Heurísticas con tablas construidas para un goal concreto: la inversa de MM
+# (goal = inicio) costaría construir una tabla nueva por caso.
+HEURISTICAS_POR_GOAL = ("pdb", "pattern_db", "exacta", "exact")
+
+def get_batch_heuristic_factory(name: str):
+    from agente___.algorithms.heuristics_np import (
+        h_hamming_batch_factory, h_manhattan_batch_factory,
+        h_manhattan_linear_conflict_batch_factory,
+    )
+    name = name.lower()
+    if name in ("hamming", "h"):
+        return h_hamming_batch_factory
+    if name in ("manhattan", "m"):
+        return h_manhattan_batch_factory
+    if name in ("linear_conflict", "mlc", "manhattan_lc", "lc"):
+        return h_manhattan_linear_conflict_batch_factory
+    raise ValueError(f"Heurística sin versión por lotes: {name}")
+
+# Heurísticas ya armadas por (nombre, goal, lotes): construirlas (tablas, PDB) cuesta
+# más que muchos casos 3x3, y el goal es el mismo en toda la corrida.
+_HEURISTICAS: dict = {}
+
+def heuristica(hname: str, goal: EstadoST, lotes: bool = False):
+    clave = (hname, goal, lotes)
+    h = _HEURISTICAS.get(clave)
+    if h is None:
+        factory = get_batch_heuristic_factory(hname) if lotes else get_heuristic_factory(hname)
+        h = _HEURISTICAS[clave] = factory(goal)
+    return h
+
+def run_once(algo: str, hname: str, grafo, inicio: EstadoST, goal: EstadoST, packed: bool = False,
+             batch: int = 0, max_nodes: int | None = None, max_bytes: int | None = None,
+             deadline_ms: float | None = None, stats: bool = False,
+             timeout_ms: float | None = None, max_expansions: int | None = None,
+             tiebreak: str | None = None):
+    h = heuristica(hname, goal)
+    h_lote = heuristica(hname, goal, lotes=True) if (batch > 0 and algo == "a*") else None
+    # MM: misma factory con el goal cambiado por el inicio para la búsqueda hacia atrás
+    h_inv = get_heuristic_factory(hname)(inicio) if algo == "mm" else None
+    inicio_t, goal_t = inicio, goal
+    if packed:
+        # la factory recibe el goal como tupla; la búsqueda va con ints
+        inicio, goal = empaquetar_estado(inicio), empaquetar_estado(goal)
+    memoria = None
+    cota = None
+    # instrumentación solo en a*/greedy (el resto de motores no la aceptan)
+    est = EstadisticasBusqueda() if (stats and algo in ("a*", "greedy")) else None
+    limites = {"max_expansiones": max_expansions, "deadline_ms": timeout_ms}
+    abortada = None
     t0 = time.perf_counter()
-    if algo == "a*":
-        camino, costo, expandidos = a_estrella(grafo, inicio, goal, h)
-    else:
-        camino, costo, expandidos = greedy_codicioso(grafo, inicio, goal, h)
+    try:
+        if algo == "a*":
+            # tiebreak "heap" (o None) = frontera heap de siempre; "indexado" = HeapIndexado
+            # con decrease-key; el resto, FronteraCubetas
+            indexado = tiebreak == "indexado"
+            desempate = tiebreak if tiebreak not in (None, "heap", "indexado") else None
+            camino, costo, expandidos = a_estrella(grafo, inicio, goal, h, h_lote=h_lote, tam_lote=batch,
+                                                   stats=est, desempate=desempate, indexado=indexado,
+                                                   **limites)
+        elif algo == "ida*":
+            camino, costo, expandidos = ida_estrella(grafo, inicio, goal, h, **limites)
+        elif algo == "mm":
+            camino, costo, expandidos = a_estrella_bidireccional(grafo, inicio, goal, h, h_inv, **limites)
+        elif algo == "sma*":
+            camino, costo, expandidos, memoria = a_estrella_memoria_acotada(
+                grafo, inicio, goal, h, max_nodos=max_nodes, max_bytes=max_bytes, **limites)
+        elif algo == "tabla":
+            # sin búsqueda: baja por la tabla de distancias exactas (solo 3x3)
+            camino, costo, expandidos = solve_by_table(inicio_t, goal_t)
+        elif algo == "ara*":
+            # anytime: el timeout solo aplica si no se pidió --deadline-ms
+            camino, costo, expandidos, cota = ara_estrella(
+                grafo, inicio, goal, h, deadline_ms=deadline_ms if deadline_ms is not None else timeout_ms,
+                max_expansiones=max_expansions)
+        else:
+            camino, costo, expandidos = greedy_codicioso(grafo, inicio, goal, h, stats=est, **limites)
+    except BusquedaAbortada as e:
+        abortada = e
+        camino, costo, expandidos = None, float("inf"), e.expandidos
+        memoria = getattr(e, "memoria", memoria)   # sma*: también al quedarse sin memoria
     t1 = time.perf_counter()
     ok = camino is not None and len(camino) > 0
     pasos = (len(camino)-1) if ok else None
-    return {
+    r = {
         "ok": ok,
         "pasos": pasos,
         "costo": costo if ok else None,
         "expandidos": expandidos,
         "ms": (t1 - t0) * 1000.0,
     }
+    if memoria is not None:
+        r["pico_nodos"] = memoria["pico_nodos"]
+        r["pico_bytes"] = memoria["pico_bytes"]
+        r["podados"] = memoria["podados"]
+        r["descartados"] = memoria["descartados"]   # nodos sin lugar para sus hijos
+    if cota is not None:
+        r["cota"] = cota  # costo <= cota * óptimo
+    if timeout_ms is not None or max_expansions is not None or algo == "sma*":
+        # caso cortado (o sma* sin memoria): motivo y mayor f alcanzado (cota inferior del
+        # óptimo con h consistente)
+        r["abortado"] = abortada.motivo if abortada is not None else ""
+        r["cota_f"] = abortada.cota_f if abortada is not None else None
+    if est is not None:
+        r.update(est.como_dict())
+    return r
+
+def columnas_esperadas(cfg: dict) -> List[str]:
+    """Columnas que escribe una corrida con cfg (las mismas que arman run_case/run_once)."""
+    algos = cfg["algos"]
+    columnas = ["case", "algo", "heuristic"]
+    if cfg["tiebreaks"] and "a*" in algos:
+        columnas.append("tiebreak")
+    columnas += ["ok", "pasos", "costo", "expandidos", "ms"]
+    if "sma*" in algos:
+        columnas += ["pico_nodos", "pico_bytes", "podados", "descartados"]
+    if "ara*" in algos:
+        columnas.append("cota")
+    if cfg["timeout_ms"] is not None or cfg["max_expansions"] is not None or "sma*" in algos:
+        columnas += ["abortado", "cota_f"]
+    if cfg["stats"] and ("a*" in algos or "greedy" in algos):
+        columnas += list(EstadisticasBusqueda().como_dict())
+    return columnas
+
+def variantes_desempate(algo: str, tiebreaks: List[str]) -> List[str | None]:
+    """Políticas de desempate a probar: solo a* las usa (None = sin columna tiebreak)."""
+    return tiebreaks if (algo == "a*" and tiebreaks) else [None]
+
+def semilla_caso(base_seed: int, case_index: int) -> str:
+    # semilla textual: estable entre procesos y ejecuciones (no depende de PYTHONHASHSEED)
+    return f"{base_seed}:{case_index}"
+
+# Configuración del proceso (la fija _init_worker en cada worker del pool)
+_CFG: dict = {}
+
+def _init_worker(cfg: dict) -> None:
+    _CFG.clear()
+    _CFG.update(cfg)
+    _CFG["goal"] = goal_canon(cfg["n"])
+    _CFG["grafo"] = GraphAdapter(SlidingLazyGraph(cfg["n"]))
+
+def run_case(i: int) -> List[dict]:
+    """Genera el caso i (semilla propia) y lo resuelve con todas las combinaciones."""
+    cfg = _CFG
+    goal = cfg["goal"]
+    rng = random.Random(semilla_caso(cfg["seed"], i))
+    if cfg["uniform"]:
+        inicio = estado_aleatorio(cfg["n"], rng, goal)
+    else:
+        inicio = generar_estado(cfg["n"], pasos_barajado=cfg["shuffle"], rng=rng)
+    assert es_soluble(inicio, goal), "Estado generado no soluble"
+
+    filas = []
+    for algo in cfg["algos"]:
+        for tiebreak in variantes_desempate(algo, cfg["tiebreaks"]):
+            for hname in cfg["heuristics"]:
+                r = run_once(algo, hname, cfg["grafo"], inicio, goal,
+                             packed=cfg["packed"], batch=cfg["batch"],
+                             max_nodes=cfg["max_nodes"], max_bytes=cfg["max_bytes"],
+                             deadline_ms=cfg["deadline_ms"], stats=cfg["stats"],
+                             timeout_ms=cfg["timeout_ms"], max_expansions=cfg["max_expansions"],
+                             tiebreak=tiebreak)
+                fila = {"case": i, "algo": algo, "heuristic": hname}
+                if tiebreak is not None:
+                    fila["tiebreak"] = tiebreak
+                filas.append({**fila, **r})
+    return filas
+
+def iter_casos(cfg: dict, casos: List[int], workers: int) -> Iterator[List[dict]]:
+    """Resultados por caso EN ORDEN, en serie o repartidos en un pool de procesos."""
+    if workers <= 1:
+        _init_worker(cfg)
+        for i in casos:
+            yield run_case(i)
+        return
+    chunk = max(1, min(16, len(casos) // (workers * 8)))
+    with mp.Pool(workers, initializer=_init_worker, initargs=(cfg,)) as pool:
+        yield from pool.imap(run_case, casos, chunksize=chunk)
+
+# --- Salida incremental ------------------------------------------------------------
+# Cada caso se agrega al archivo (CSV, o JSON lines si termina en .jsonl) y se
+# hace flush apenas termina: si el proceso muere se pierde a lo sumo el caso en
+# curso, y --resume retoma desde ahí. El resumen sale de agregados que se
+# actualizan caso a caso, sin guardar las filas en memoria.
+
+def _es_jsonl(ruta: str) -> bool:
+    return ruta.endswith((".jsonl", ".ndjson"))
+
+def _tipar_fila_csv(r: dict) -> dict:
+    """Un CSV devuelve todo como texto: recuperar los tipos que usa el resumen."""
+    fila = dict(r)
+    fila["case"] = int(r["case"])
+    fila["ok"] = r["ok"] == "True"
+    fila["pasos"] = int(r["pasos"]) if r["pasos"] else None
+    fila["expandidos"] = int(r["expandidos"])
+    fila["ms"] = float(r["ms"])
+    if "tiebreak" in r:
+        # solo si el archivo tiene la columna: retomar() reescribe con las columnas leídas
+        fila["tiebreak"] = r["tiebreak"] or None
+    return fila
+
+def leer_resultados(ruta: str) -> Tuple[List[str] | None, List[dict]]:
+    """(columnas del CSV o None para JSONL, filas) de un archivo de resultados."""
+    with open(ruta, newline="", encoding="utf-8") as f:
+        texto = f.read()
+    texto = texto[:texto.rfind("\n") + 1]      # descartar una última línea a medio escribir
+    if _es_jsonl(ruta):
+        return None, [json.loads(linea) for linea in texto.splitlines()]
+    lector = csv.DictReader(io.StringIO(texto, newline=""))
+    if lector.fieldnames and "case" not in lector.fieldnames:
+        raise ValueError(f"{ruta}: no tiene filas por caso (falta la columna 'case'); "
+                         "¿es un archivo de promedios?")
+    return lector.fieldnames, [_tipar_fila_csv(r) for r in lector]
+
+class SalidaResultados:
+    """Archivo de resultados abierto en modo append; escribir() hace flush por caso."""
+    def __init__(self, ruta: str, columnas: List[str] | None = None):
+        self.jsonl = _es_jsonl(ruta)
+        self.columnas = columnas
+        self._f = open(ruta, "a", newline="", encoding="utf-8")
+        self._writer = None
+
+    def escribir(self, filas: List[dict]) -> None:
+        if self.jsonl:
+            for r in filas:
+                self._f.write(json.dumps(r, ensure_ascii=False) + "\n")
+        else:
+            if self._writer is None:
+                if self.columnas is None:
+                    # unión de columnas: algunos algoritmos (sma*) agregan campos propios;
+                    # cada caso corre todas las combinaciones, así que el primero las tiene todas
+                    self.columnas = list(dict.fromkeys(k for r in filas for k in r))
+                self._writer = csv.DictWriter(self._f, fieldnames=self.columnas)
+                if self._f.tell() == 0:
+                    self._writer.writeheader()
+            self._writer.writerows(filas)
+        self._f.flush()
+
+    def cerrar(self) -> None:
+        self._f.close()
+
+class ResumenIncremental:
+    """Agregados por (algo, tiebreak, heurística), actualizados con cada caso."""
+    def __init__(self, tiebreak_base: str | None = None):
+        self.tiebreak_base = tiebreak_base
+        self.grupos: Dict[tuple, Dict[str, float]] = {}
+        # (algo, heurística, tiebreak) -> [expandidos base, expandidos tiebreak] en casos
+        # que resolvieron ambos
+        self.comunes: Dict[tuple, List[int]] = {}
+
+    def agregar(self, filas: List[dict]) -> None:
+        resueltas = {}
+        for r in filas:
+            g = self.grupos.setdefault((r["algo"], r.get("tiebreak"), r["heuristic"]), dict.fromkeys(
+                ("casos", "ok", "con_pasos", "pasos", "ms", "expandidos", "abortados"), 0))
+            g["casos"] += 1
+            if r.get("abortado"):
+                g["abortados"] += 1
+            if r["ok"]:
+                g["ok"] += 1
+                g["ms"] += r["ms"]
+                g["expandidos"] += r["expandidos"]
+                if r["pasos"] is not None:
+                    g["con_pasos"] += 1
+                    g["pasos"] += r["pasos"]
+                resueltas[(r["algo"], r["heuristic"], r.get("tiebreak"))] = r["expandidos"]
+        if self.tiebreak_base is None:
+            return
+        for (algo, hname, tiebreak), exp in resueltas.items():
+            exp_base = resueltas.get((algo, hname, self.tiebreak_base))
+            if tiebreak not in (None, self.tiebreak_base) and exp_base is not None:
+                c = self.comunes.setdefault((algo, hname, tiebreak), [0, 0])
+                c[0] += exp_base
+                c[1] += exp
+
+    def linea(self, algo: str, tiebreak: str | None, hname: str) -> str:
+        g = self.grupos.get((algo, tiebreak, hname))
+        if g is None:
+            g = dict.fromkeys(("casos", "ok", "con_pasos", "pasos", "ms", "expandidos", "abortados"), 0)
+        ok_rate = g["ok"] / g["casos"] if g["casos"] else 0.0
+        pasos_avg = g["pasos"] / g["con_pasos"] if g["con_pasos"] else 0.0
+        ms_avg = g["ms"] / g["ok"] if g["ok"] else 0.0
+        exp_avg = g["expandidos"] / g["ok"] if g["ok"] else 0.0
+        extra = f"  abortados={g['abortados']}" if g["abortados"] else ""
+        nombre = algo if tiebreak is None else f"{algo}[{tiebreak}]"
+        c = self.comunes.get((algo, hname, tiebreak))
+        if c is not None and c[0]:
+            # % de cambio en expansiones frente a la frontera base, en los casos comunes
+            extra += f"  exp_vs_{self.tiebreak_base}={(c[1] / c[0] - 1.0) * 100.0:+.1f}%"
+        return (f"{nombre} / {hname}: ok={ok_rate*100:.1f}%  pasos_avg={pasos_avg:.2f}  "
+                f"ms_avg={ms_avg:.1f}  exp_avg={exp_avg:.1f}{extra}")
+
+def retomar(ruta: str, combinaciones: set, columnas_cfg: List[str],
+            resumen: ResumenIncremental) -> Tuple[set, List[str] | None]:
+    """
+    Lee una corrida previa: agrega al resumen los casos completos y devuelve
+    (índices hechos, columnas). Reescribe el archivo solo con esos casos (un corte
+    pudo dejar un caso o una línea a medias). Si el archivo es de otra configuración
+    (combinaciones (algo, tiebreak, heurística) o columnas distintas) lanza
+    ValueError sin tocarlo.
+    """
+    columnas, previas = leer_resultados(ruta)
+    if previas:
+        en_archivo = {(r["algo"], r.get("tiebreak"), r["heuristic"]) for r in previas}
+        if en_archivo != combinaciones:
+            raise ValueError(
+                f"{ruta} es de otra configuración: sobran {sorted(en_archivo - combinaciones, key=str)}, "
+                f"faltan {sorted(combinaciones - en_archivo, key=str)}; use las mismas "
+                "--algos/--heuristics/--tiebreaks u otro --out")
+        en_archivo = set(columnas) if columnas is not None else {k for r in previas for k in r}
+        if en_archivo != set(columnas_cfg):
+            raise ValueError(
+                f"{ruta} tiene otras columnas: sobran {sorted(en_archivo - set(columnas_cfg))}, "
+                f"faltan {sorted(set(columnas_cfg) - en_archivo)}; use las mismas opciones "
+                "(--stats, --timeout-ms, --max-expansions...) u otro --out")
+    filas_por_caso = len(combinaciones)
+    por_caso: Dict[int, List[dict]] = {}
+    for r in previas:
+        por_caso.setdefault(r["case"], []).append(r)
+    completos = {i: filas for i, filas in por_caso.items() if len(filas) == filas_por_caso}
+    filas_completas = [r for i in sorted(completos) for r in completos[i]]
+    raiz, ext = os.path.splitext(ruta)
+    tmp = f"{raiz}.tmp{ext}"                    # misma extensión: mismo formato
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    salida = SalidaResultados(tmp, columnas)
+    if filas_completas:
+        salida.escribir(filas_completas)
+    salida.cerrar()
+    os.replace(tmp, ruta)
+    for i in sorted(completos):
+        resumen.agregar(completos[i])
+    return set(completos), columnas
+
+# --- Comparación contra una corrida base ----------------------------------------------
+# Las filas se emparejan por (case, algo, tiebreak, heurística): la base tiene que
+# venir de la misma --n/--shuffle/--seed para que el caso i sea el mismo estado.
+# Por configuración se informan p50/p90/p99 de ms y expansiones en ambas corridas y
+# el cambio del total con un IC 95% por bootstrap pareado (se remuestrean casos).
+# Es regresión si hasta el extremo inferior del IC supera el umbral.
+
+def percentil(valores: List[float], p: float) -> float:
+    """Percentil p (0-100) con interpolación lineal; valores ya ordenados."""
+    if not valores:
+        return float("nan")
+    x = (len(valores) - 1) * p / 100.0
+    i = int(x)
+    if i + 1 >= len(valores):
+        return valores[-1]
+    return valores[i] + (valores[i + 1] - valores[i]) * (x - i)
+
+def ic_bootstrap(base: List[float], nuevo: List[float], remuestreos: int = 1000,
+                 semilla: int = 0) -> Tuple[float, float, float]:
+    """(cambio %, IC 2.5%, IC 97.5%) de sum(nuevo)/sum(base) - 1 sobre pares (base[i], nuevo[i])."""
+    def cambio(indices) -> float:
+        total_base = sum(base[i] for i in indices)
+        return (sum(nuevo[i] for i in indices) / total_base - 1.0) * 100.0 if total_base else 0.0
+    rng = random.Random(semilla)
+    m = len(base)
+    muestras = sorted(cambio([rng.randrange(m) for _ in range(m)]) for _ in range(remuestreos))
+    return cambio(range(m)), percentil(muestras, 2.5), percentil(muestras, 97.5)
+
+def _por_configuracion(filas: List[dict]) -> Dict[tuple, Dict[int, dict]]:
+    grupos: Dict[tuple, Dict[int, dict]] = {}
+    for r in filas:
+        grupos.setdefault((r["algo"], r.get("tiebreak"), r["heuristic"]), {})[r["case"]] = r
+    return grupos
+
+def comparar_con_base(ruta_base: str, ruta_nueva: str, umbral_pct: float = 10.0,
+                      remuestreos: int = 1000) -> bool:
+    """Imprime la comparación y devuelve True si alguna configuración empeoró más que el umbral."""
+    base = _por_configuracion(leer_resultados(ruta_base)[1])
+    nueva = _por_configuracion(leer_resultados(ruta_nueva)[1])
+    print(f"\n=== Comparación con {ruta_base} (umbral {umbral_pct:+.1f}%) ===")
+    regresiones = []
+    for clave in sorted(nueva, key=str):
+        algo, tiebreak, hname = clave
+        nombre = algo if tiebreak is None else f"{algo}[{tiebreak}]"
+        casos_base = base.get(clave)
+        if not casos_base:
+            print(f"{nombre} / {hname}: sin filas en la base")
+            continue
+        comunes = sorted(c for c in nueva[clave].keys() & casos_base.keys()
+                         if nueva[clave][c]["ok"] and casos_base[c]["ok"])
+        print(f"{nombre} / {hname}: {len(comunes)} casos resueltos en ambas")
+        if not comunes:
+            continue
+        for metrica in ("ms", "expandidos"):
+            xs = [float(casos_base[c][metrica]) for c in comunes]
+            ys = [float(nueva[clave][c][metrica]) for c in comunes]
+            pb = [percentil(sorted(xs), p) for p in (50, 90, 99)]
+            pn = [percentil(sorted(ys), p) for p in (50, 90, 99)]
+            cambio, ic_inf, ic_sup = ic_bootstrap(xs, ys, remuestreos)
+            marca = ""
+            if ic_inf > umbral_pct:
+                marca = "  <- REGRESIÓN"
+                regresiones.append(f"{nombre} / {hname} / {metrica}")
+            print(f"  {metrica:<10} p50/p90/p99 base={pb[0]:.1f}/{pb[1]:.1f}/{pb[2]:.1f}"
+                  f"  nuevo={pn[0]:.1f}/{pn[1]:.1f}/{pn[2]:.1f}"
+                  f"  total {cambio:+.1f}% [IC95 {ic_inf:+.1f}%, {ic_sup:+.1f}%]{marca}")
+    if regresiones:
+        print("Regresiones: " + ", ".join(regresiones))
+    return bool(regresiones)
+
+# --- Micro-benchmark de heurísticas ---------------------------------------------------
+
+def micro_heuristicas(heuristics: List[str], tamanos: List[int], cantidad: int = 1000, seed: int = 0) -> None:
+    """us por h(s) y por h.update(...) (un hijo de cada estado) en estados uniformes."""
+    print("=== Micro-benchmark de heurísticas (us por llamada) ===")
+    for n in tamanos:
+        goal = goal_canon(n)
+        rng = random.Random(f"{seed}:{n}")
+        estados = [estado_aleatorio(n, rng, goal) for _ in range(cantidad)]
+        grafo = SlidingLazyGraph(n)
+        pasos = []
+        for s in estados:
+            hueco = s.index(0)
+            hijo, hueco_hijo, ficha = next(grafo.expandir(s, hueco))
+            pasos.append((s, ficha, hueco_hijo, hueco, hijo))
+        for hname in heuristics:
+            try:
+                h = get_heuristic_factory(hname)(goal)
+                h(goal)                                 # tablas perezosas fuera de la medición
+            except ValueError as e:
+                print(f"n={n} {hname}: {e}")
+                continue
+            t0 = time.perf_counter()
+            valores = [h(s) for s in estados]
+            us_h = (time.perf_counter() - t0) / cantidad * 1e6
+            update = getattr(h, "update", None)
+            extra = ""
+            if update is not None:
+                t0 = time.perf_counter()
+                for (s, ficha, desde, hasta, hijo), h_s in zip(pasos, valores):
+                    update(h_s, ficha, desde, hasta, hijo)
+                extra = f"  update={(time.perf_counter() - t0) / cantidad * 1e6:.2f}"
+            print(f"n={n} {hname:<16} h={us_h:.2f}{extra}")
+
+def verificar_heuristicas(heuristics: List[str]) -> bool:
+    """Cada heurística contra la tabla exacta 3x3; True si alguna falla."""
+    goal = goal_canon(3)
+    falla = False
+    for hname in heuristics:
+        cuenta = verificar_heuristica(get_heuristic_factory(hname)(goal), goal)
+        mal = cuenta["sobreestima"] + cuenta["inconsistentes"] + cuenta["update_distinto"]
+        falla = falla or mal > 0
+        print(f"{hname:<16} estados={cuenta['estados']} sobreestima={cuenta['sobreestima']} "
+              f"inconsistentes={cuenta['inconsistentes']} update_distinto={cuenta['update_distinto']}"
+              f"  {'FALLA' if mal else 'ok'}")
+    return falla
 
 def main():
     parser = argparse.ArgumentParser(description="Benchmark N-puzzle (1000 casos aleatorios)")
     parser.add_argument("--n", type=int, default=3, help="Tamaño del tablero (n x n)")
     parser.add_argument("--count", type=int, default=1000, help="Número de casos aleatorios")
     parser.add_argument("--shuffle", type=int, default=100, help="Pasos de barajado desde el goal para generar cada estado")
-    parser.add_argument("--out", type=str, default="results.csv", help="Ruta al CSV con resultados detallados")
+    parser.add_argument("--uniform", action="store_true", help="Casos uniformes entre las permutaciones solubles (ignora --shuffle; en 4x4 son muy difíciles)")
+    parser.add_argument("--out", type=str, default="results.csv", help="Ruta al CSV con resultados detallados (.jsonl: una fila JSON por línea)")
+    parser.add_argument("--resume", action="store_true", help="Saltar los casos que ya están completos en --out y seguir agregando (necesita --seed)")
+    parser.add_argument("--heuristics", type=str, default="hamming,manhattan,linear_conflict", help="Heurísticas separadas por coma (hamming, manhattan, linear_conflict, wd, wd_lc, pdb, exacta)")
+    parser.add_argument("--packed", action="store_true", help="Buscar con estados empaquetados en un int")
+    parser.add_argument("--batch", type=int, default=0, help="A* por lotes con heurísticas NumPy (tamaño de lote; 0 = desactivado, no combinable con --packed)")
+    parser.add_argument("--algos", type=str, default="a*,greedy", help="Algoritmos separados por coma (a*, ida*, mm, sma*, ara*, greedy, tabla); mm no admite pdb/exacta")
+    parser.add_argument("--deadline-ms", type=float, default=None, help="ara*: mejor camino encontrado en X ms")
+    parser.add_argument("--max-nodes", type=int, default=None, help="sma*: máximo de nodos en memoria")
+    parser.add_argument("--max-bytes", type=int, default=None, help="sma*: memoria máxima estimada en bytes")
+    parser.add_argument("--timeout-ms", type=float, default=None, help="Corta cada búsqueda a los X ms y la registra como abortada")
+    parser.add_argument("--max-expansions", type=int, default=None, help="Corta cada búsqueda tras X expansiones y la registra como abortada")
+    parser.add_argument("--tiebreaks", type=str, default="", help="a*: fronteras a comparar separadas por coma (heap, indexado, max_g, lifo, fifo); las de cubetas necesitan h entera")
+    parser.add_argument("--stats", action="store_true", help="a*/greedy: agregar al CSV generados, reabiertos, pops obsoletos, pico de frontera y ms en h/sucesores")
+    parser.add_argument("--workers", type=int, default=1, help="Procesos en paralelo (1 = en serie)")
+    parser.add_argument("--seed", type=int, default=None, help="Semilla base; el caso i usa (seed, i). Sin ella se sortea una y se imprime")
+    parser.add_argument("--baseline", type=str, default=None, help="CSV/JSONL de una corrida anterior (misma --n/--shuffle/--seed) para comparar caso a caso")
+    parser.add_argument("--compare-only", action="store_true", help="No correr: comparar el --out existente con --baseline")
+    parser.add_argument("--regression-threshold", type=float, default=10.0, help="%% de empeoramiento (extremo inferior del IC 95%%) que cuenta como regresión; sale con código 1")
+    parser.add_argument("--bootstrap", type=int, default=1000, help="Remuestreos del bootstrap de la comparación")
+    parser.add_argument("--micro", action="store_true", help="Solo medir us por h(s) y h.update de --heuristics en --count estados por tamaño")
+    parser.add_argument("--micro-sizes", type=str, default="3,4,5", help="Tamaños de tablero para --micro")
+    parser.add_argument("--check-h", action="store_true", help="Solo verificar --heuristics contra la tabla exacta 3x3 (admisible, consistente, h.update); sale con código 1 si alguna falla")
     args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")   # avisos de tablas en construcción
+    if args.micro:
+        tamanos = [int(x) for x in args.micro_sizes.split(",") if x.strip()]
+        heuristics = [x.strip().lower() for x in args.heuristics.split(",") if x.strip()]
+        micro_heuristicas(heuristics, tamanos, args.count, args.seed or 0)
+        return
+    if args.check_h:
+        heuristics = [x.strip().lower() for x in args.heuristics.split(",") if x.strip()]
+        sys.exit(1 if verificar_heuristicas(heuristics) else 0)
+    if args.batch > 0 and args.packed:
+        parser.error("--batch evalúa h con NumPy sobre tuplas: no se combina con --packed")
+    if args.resume and args.seed is None:
+        parser.error("--resume necesita la misma --seed de la corrida original")
+    if args.compare_only:
+        if args.baseline is None:
+            parser.error("--compare-only necesita --baseline")
+        try:
+            regresion = comparar_con_base(args.baseline, args.out, args.regression_threshold, args.bootstrap)
+        except ValueError as e:       # p.ej. un archivo de promedios en vez de filas por caso
+            parser.error(str(e))
+        sys.exit(1 if regresion else 0)
+    if args.baseline is not None and os.path.exists(args.baseline):
+        try:
+            leer_resultados(args.baseline)   # rechazarla antes de correr, no al final
+        except ValueError as e:
+            parser.error(str(e))
 
     n = args.n
-    goal = goal_canon(n)
-    grafo = GraphAdapter(SlidingLazyGraph())
-    algos = ["a*", "greedy"]
-    heuristics = ["hamming", "manhattan", "linear_conflict"]
+    algos = [a.strip().lower() for a in args.algos.split(",") if a.strip()]
+    heuristics = [x.strip().lower() for x in args.heuristics.split(",") if x.strip()]
+    tiebreaks = [x.strip().lower() for x in args.tiebreaks.split(",") if x.strip()]
+    if args.batch > 0 and any(tb != "heap" for tb in tiebreaks):
+        parser.error("--batch usa su propio heap: en --tiebreaks solo admite heap")
+    por_goal = [x for x in heuristics if x in HEURISTICAS_POR_GOAL]
+    if "mm" in algos and por_goal:
+        parser.error(f"mm necesita la heurística inversa hacia cada inicio y {', '.join(por_goal)} "
+                     "construiría una tabla por caso; use otra heurística o saque mm")
+    seed = args.seed if args.seed is not None else random.SystemRandom().randrange(2**31)
+    print(f"[seed={seed}] workers={args.workers}")
 
     if os.path.dirname(args.out):
         os.makedirs(os.path.dirname(args.out), exist_ok=True)
 
-    rows: List[dict] = []
-    for i in range(args.count):
-        inicio = generar_estado(n, pasos_barajado=args.shuffle, seed=None)
-        assert es_soluble(inicio, goal), "Estado generado no soluble"
-
-        for algo in algos:
-            for hname in heuristics:
-                r = run_once(algo, hname, grafo, inicio, goal)
-                rows.append({
-                    "case": i,
-                    "algo": algo,
-                    "heuristic": hname,
-                    **r
-                })
-        if (i+1) % 50 == 0:
-            print(f"[{i+1}/{args.count}] casos completados...")
-
-    # Guardar CSV
-    with open(args.out, "w", newline="", encoding="utf-8") as f:
-        import csv
-        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
-        writer.writeheader()
-        writer.writerows(rows)
+    cfg = {
+        "n": n, "shuffle": args.shuffle, "uniform": args.uniform, "seed": seed,
+        "algos": algos, "heuristics": heuristics,
+        "packed": args.packed, "batch": args.batch,
+        "max_nodes": args.max_nodes, "max_bytes": args.max_bytes,
+        "deadline_ms": args.deadline_ms, "stats": args.stats,
+        "timeout_ms": args.timeout_ms, "max_expansions": args.max_expansions,
+        "tiebreaks": tiebreaks,
+    }
+    combos = [(algo, tb) for algo in algos for tb in variantes_desempate(algo, tiebreaks)]
+    resumen = ResumenIncremental(tiebreaks[0] if tiebreaks else None)
+    hechos, columnas = set(), None
+    if args.resume and os.path.exists(args.out):
+        combinaciones = {(algo, tb, hname) for algo, tb in combos for hname in heuristics}
+        try:
+            hechos, columnas = retomar(args.out, combinaciones, columnas_esperadas(cfg), resumen)
+        except ValueError as e:
+            parser.error(str(e))
+        print(f"[resume] {len(hechos)} casos ya completos en {args.out}")
+    elif os.path.exists(args.out):
+        os.remove(args.out)
+    pendientes = [i for i in range(args.count) if i not in hechos]
+
+    salida = SalidaResultados(args.out, columnas)
+    try:
+        for k, filas in enumerate(iter_casos(cfg, pendientes, args.workers), start=1):
+            salida.escribir(filas)
+            resumen.agregar(filas)
+            if k % 50 == 0:
+                print(f"[{k}/{len(pendientes)}] casos completados...")
+    finally:
+        salida.cerrar()
 
     # Resumen por (algo, heurística)
     print("\n=== Resumen ===")
-    for algo in algos:
+    for algo, tiebreak in combos:
         for hname in heuristics:
-            subset = [r for r in rows if r["algo"] == algo and r["heuristic"] == hname]
-            ok_rate = sum(1 for r in subset if r["ok"]) / len(subset)
-            pasos = [r["pasos"] for r in subset if r["ok"] and r["pasos"] is not None]
-            tiempos = [r["ms"] for r in subset if r["ok"]]
-            expanded = [r["expandidos"] for r in subset if r["ok"]]
-            pasos_avg = (sum(pasos) / len(pasos)) if pasos else 0.0
-            ms_avg = (sum(tiempos) / len(tiempos)) if tiempos else 0.0
-            exp_avg = (sum(expanded) / len(expanded)) if expanded else 0.0
-            print(f"{algo} / {hname}: ok={ok_rate*100:.1f}%  pasos_avg={pasos_avg:.2f}  ms_avg={ms_avg:.1f}  exp_avg={exp_avg:.1f}")
+            print(resumen.linea(algo, tiebreak, hname))
+
+    if args.baseline is not None and comparar_con_base(args.baseline, args.out,
+                                                       args.regression_threshold, args.bootstrap):
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()